@@ -1,33 +1,26 @@
-from copy import deepcopy
-from itertools import product
+from typing import List, Optional, TypeVar
 
+from tictactoe.games.symmetry import Symmetry
 
-def rotate(board, inverse=False):
-    new_board = deepcopy(board)
-    for j, row in enumerate(board):
-        for i, mark in enumerate(row):
-            if not inverse:
-                new_board[3 - j][i] = mark
-            else:
-                new_board[j][3 - i] = mark
-    return new_board
+T = TypeVar("T")
 
 
-def vflip(board, inverse=False):
-    new_board = deepcopy(board)
-    for j, row in enumerate(board):
-        for i, mark in enumerate(row):
-            new_board[3 - i][j] = mark
-    return new_board
+def rotate(board: List[List[T]], inverse: bool = False) -> List[List[T]]:
+    symmetry = Symmetry.ROTATE_270 if inverse else Symmetry.ROTATE_90
+    return symmetry.apply_to_board(board)
 
 
-def hflip(board, inverse=False):
-    new_board = deepcopy(board)
-    for j, row in enumerate(board):
-        for i, mark in enumerate(row):
-            new_board[i][3 - j] = mark
-    return new_board
+def vflip(board: List[List[T]], inverse: bool = False) -> List[List[T]]:
+    return Symmetry.VFLIP.apply_to_board(board)
 
 
-def match(board, target):
-    for 
\ No newline at end of file
+def hflip(board: List[List[T]], inverse: bool = False) -> List[List[T]]:
+    return Symmetry.HFLIP.apply_to_board(board)
+
+
+def match(board: List[List[T]], target: List[List[T]]) -> Optional[Symmetry]:
+    """Find a symmetry that turns board into target, if there is one."""
+    for symmetry in Symmetry:
+        if symmetry.apply_to_board(board) == target:
+            return symmetry
+    return None
@@ -0,0 +1,38 @@
+from unittest import mock
+
+import pytest
+
+from tictactoe import arena
+from tictactoe.constants import Mark
+
+
+def test_play_match_runs_to_the_end():
+    result = arena._play_match(("game", "random", "peek_ahead", None, 0))
+    assert result.x_player == "random"
+    assert 5 <= len(result.moves) <= 9
+    assert len(set(result.moves)) == len(result.moves)
+
+
+def test_schedule_alternates_sides():
+    tasks = list(arena.schedule("game", ["a", "b", "c"], 2, None, 0))
+    assert len(tasks) == 6
+    assert [task[1:3] for task in tasks[:2]] == [("a", "b"), ("b", "a")]
+
+
+def test_ratings_follow_results():
+    results = [
+        arena.MatchResult("strong", "weak", Mark.X, [], 0.0),
+        arena.MatchResult("weak", "strong", Mark.O, [], 0.0),
+        arena.MatchResult("strong", "weak", Mark.NOBODY, [], 0.0),
+    ]
+    assert arena.tally(results) == {"strong": [2, 1, 0], "weak": [0, 1, 2]}
+    ratings = arena.elo_ratings(results)
+    assert ratings["strong"] > 1500 > ratings["weak"]
+
+
+def test_only_computer_players_are_accepted():
+    with pytest.raises(ValueError):
+        next(arena.run_arena("game", ["random", "human"], 1, 1))
+    with mock.patch("sys.argv", ["arena", "--players", "random", "human"]):
+        with pytest.raises(SystemExit):
+            arena.main()
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from tictactoe import arena
+from tictactoe.constants import Mark
+from tictactoe.games import Game, Supergame
+from tictactoe.players import PeekAheadAI, RandomAI, silent_listener, silent_speaker
+
+np = pytest.importorskip("numpy")
+batch = pytest.importorskip("tictactoe.batch")
+
+
+def scalar_outcomes(game_type, x_type, o_type, games):
+    random.seed(0)
+    outcomes = {"X": 0, "O": 0, "draw": 0}
+    for _ in range(games):
+        players = {
+            Mark.X: x_type(silent_speaker, silent_listener),
+            Mark.O: o_type(silent_speaker, silent_listener),
+        }
+        winner, _moves = arena.play_game(game_type(), players)
+        outcomes["draw" if winner is Mark.NOBODY else winner.name] += 1
+    return outcomes
+
+
+def test_games_end_with_a_line_or_a_full_board():
+    simulator = batch.BatchSimulator(Game, seed=0)
+    winners, lengths = simulator.play(1000)
+    assert set(np.unique(winners)) <= {0, 1, 2}
+    assert (lengths[winners == 0] == 9).all()
+    assert (lengths[winners == 1] % 2 == 1).all()
+    assert (lengths[winners == 2] % 2 == 0).all()
+    assert lengths.min() >= 5
+
+
+@pytest.mark.parametrize("game_type,x_type,o_type", [
+    (Game, RandomAI, RandomAI),
+    (Game, RandomAI, PeekAheadAI),
+    (Supergame, PeekAheadAI, RandomAI),
+])
+def test_matches_scalar_players(game_type, x_type, o_type):
+    policies = {RandomAI: "random", PeekAheadAI: "peek_ahead"}
+    games = 2000
+    expected = scalar_outcomes(game_type, x_type, o_type, games)
+    outcomes = batch.simulate(
+        game_type, games * 10, policies[x_type], policies[o_type], seed=0
+    )
+    for outcome in expected:
+        assert outcomes[outcome] / (games * 10) == pytest.approx(
+            expected[outcome] / games, abs=0.04
+        )
@@ -0,0 +1,38 @@
+from unittest import mock
+
+from tictactoe import benchmark
+from tictactoe.constants import Mark
+from tictactoe.games import Supergame
+from tictactoe.players import FlawlessAI
+
+
+def test_corpus_is_repeatable_and_unfinished():
+    corpus = benchmark.supergame_corpus(6, seed=3)
+    again = benchmark.supergame_corpus(6, seed=3)
+    assert [game.board for game in corpus] == [game.board for game in again]
+    assert all(game.winner() is Mark.NOBODY for game in corpus)
+
+
+def test_node_count_grows_with_depth():
+    agent = FlawlessAI(mock.MagicMock(), mock.MagicMock())
+    game = Supergame()
+    agent.score_move(game, (0, 0), 0)
+    assert agent.nodes == 1
+    agent.score_move(game, (1, 1), 1)
+    assert agent.nodes == 1 + 1 + 15
+
+
+def test_run_and_compare():
+    corpus = benchmark.supergame_corpus(2)
+    results = benchmark.run_benchmarks(corpus, [1], repeat=1, calls=2, min_seconds=0)
+    assert "score_move_depth_1" in results
+    assert all(result["rate"] > 0 for result in results.values())
+
+    slower = {name: dict(result) for name, result in results.items()}
+    slower["winner"]["rate"] *= 2
+    comparisons = {
+        name: regression
+        for name, _, regression in benchmark.compare(results, slower, 0.1)
+    }
+    assert comparisons["winner"]
+    assert not comparisons["open_squares"]
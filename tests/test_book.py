@@ -0,0 +1,40 @@
+from unittest import mock
+
+import pytest
+
+from tictactoe import book
+from tictactoe.constants import Mark
+from tictactoe.games import Game, Symmetry
+from tictactoe.players import FlawlessAI
+
+X = Mark.X
+Q = Mark.O
+_ = Mark.NOBODY
+
+
+@pytest.fixture
+def agent():
+    return FlawlessAI(mock.MagicMock(), mock.MagicMock())
+
+
+@pytest.fixture
+def book_directory(agent, tmp_path, monkeypatch):
+    monkeypatch.setattr(book, "BOOK_DIRECTORY", tmp_path)
+    entries = book.build_book(agent, Game, 3, 9)
+    book.write_book(book.book_path(Game), Game.SIZE, entries)
+    return tmp_path
+
+
+def test_book_covers_symmetric_positions(book_directory):
+    opening_book = book.OpeningBook(book.book_path(Game))
+    board = [[X, _, _], [_, _, _], [_, _, _]]
+    for symmetry in Symmetry:
+        game = Game(symmetry.apply_to_board(board))
+        assert opening_book.best_move(game) == symmetry.apply((1, 1), 3)
+    assert opening_book.best_move(Game([[X, Q, X], [_, _, _], [_, _, _]])) is None
+
+
+def test_agent_answers_from_book(agent, book_directory):
+    game = Game([[_, _, _], [_, _, _], [_, _, X]])
+    assert agent.book_move(game) == (1, 1)
+    assert agent.get_move(game) == (1, 1)
@@ -0,0 +1,62 @@
+import pytest
+
+from tictactoe.bulk import evaluate_lines
+
+LINES = [
+    "XO..XO.......... first",
+    "",
+    "X.X..XXO.OO..O..",
+    "XXXXOOO......... over",
+    "XO",
+    "OO..............",
+    "....X.O..O.X.... last",
+]
+
+
+def test_results_follow_the_input():
+    results = list(evaluate_lines(LINES, max_depth=2))
+    assert [result.get("id") for result in results] == [
+        "first",
+        None,
+        "over",
+        None,
+        None,
+        "last",
+    ]
+    assert results[0]["depth"] == 2
+    assert results[1]["move"] == [0, 1]  # X wins at once
+    assert results[1]["moves_to_outcome"] == 0
+    assert results[0]["moves_to_outcome"] is None
+    assert results[2]["error"] == "the game is over"
+    assert "error" in results[3]
+    assert results[4]["error"].startswith("X must have")
+
+
+def test_node_budget_cuts_searches_short():
+    result = next(evaluate_lines(LINES[-1:], node_budget=300))
+    assert result["nodes"] < 400
+    deeper = next(evaluate_lines(LINES[-1:], node_budget=3000))
+    assert deeper["depth"] > result["depth"]
+
+
+def test_cut_short_depths_are_not_reported():
+    cut_short = next(evaluate_lines(LINES[:1], node_budget=2000))
+    complete = next(evaluate_lines(LINES[:1], max_depth=cut_short["depth"]))
+    assert cut_short["move"] == complete["move"]
+    assert cut_short["score"] == complete["score"]
+
+
+def test_workers_keep_the_input_order():
+    serial = list(evaluate_lines(LINES, max_depth=2))
+    parallel = list(evaluate_lines(LINES, max_depth=2, workers=2))
+    assert [result["position"] for result in parallel] == [
+        result["position"] for result in serial
+    ]
+    assert [result.get("depth") for result in parallel] == [
+        result.get("depth") for result in serial
+    ]
+
+
+def test_a_limit_is_needed():
+    with pytest.raises(ValueError):
+        list(evaluate_lines(LINES))
@@ -0,0 +1,87 @@
+import io
+import subprocess
+import sys
+import time
+
+import pytest
+
+from tictactoe.engine import Engine
+
+
+@pytest.fixture
+def engine():
+    engine = Engine(io.StringIO())
+    yield engine
+    engine.stop()
+
+
+def replies(engine):
+    engine.finish()
+    lines = engine.output.getvalue().splitlines()
+    engine.output.seek(0)
+    engine.output.truncate()
+    return lines
+
+
+def test_search_answers_with_a_best_move(engine):
+    assert engine.handle("isready")
+    engine.handle("position supergame board XO..XO.......... moves 3,3")
+    engine.handle("go depth 2")
+    ready, info, best_move = replies(engine)
+    assert ready == "readyok"
+    assert info.startswith("info depth 2 ")
+    assert best_move.startswith("bestmove ")
+    row, col = (int(index) for index in best_move.split()[1].split(","))
+    assert (row, col) in engine.game.open_squares()
+
+
+def test_tables_stay_warm_between_requests(engine):
+    searches = []
+    for _ in range(2):
+        engine.handle("position supergame moves 1,1 2,2 1,2 0,0 3,3")
+        engine.handle("go depth 3")
+        engine.finish()
+        searches.append(engine.agents[type(engine.game)].last_stats)
+    assert searches[1].nodes < searches[0].nodes
+
+
+def test_stop_ends_an_infinite_search(engine):
+    engine.handle("position 7x7-5 moves 3,3")
+    engine.handle("go infinite")
+    time.sleep(0.2)
+    start_time = time.time()
+    engine.handle("stop")
+    assert time.time() - start_time < 0.5
+    assert replies(engine)[-1].startswith("bestmove ")
+    assert engine.handle("quit") is False
+
+
+def test_bad_commands_get_errors(engine):
+    for command in [
+        "fly",
+        "position chess",
+        "position game moves 1,1 1,1",
+        "position game moves 3,3",
+        "position game board XXX",
+        "go depth",
+    ]:
+        engine.handle(command)
+    lines = replies(engine)
+    assert len(lines) == 6
+    assert all(line.startswith("error ") for line in lines)
+
+
+def test_engine_leaves_other_players_unloaded():
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, tictactoe.engine; print(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    assert "tictactoe.players.flawless" in loaded
+    for module in ["tictactoe.players.mcts", "tictactoe.players.human", "argparse"]:
+        assert module not in loaded
@@ -0,0 +1,132 @@
+import pickle
+import random
+
+import pytest
+
+from tictactoe.constants import Mark, SquareFilled
+from tictactoe.games import Game, Supergame, game_type_by_name, k_in_a_row
+
+X = Mark.X
+Q = Mark.O
+_ = Mark.NOBODY
+
+
+def test_board_round_trip():
+    board = [
+        [X, _, _, Q],
+        [_, X, Q, _],
+        [_, _, _, _],
+        [Q, _, _, X],
+    ]
+    game = Supergame(board)
+    assert game.board == board
+    assert game.get_board() is not game.get_board()
+
+
+def test_open_squares_and_next_mark():
+    game = Game([[X, Q, X], [_, _, _], [_, _, _]])
+    assert game.open_squares() == {(1, 0), (1, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+    assert game.next_mark() is Q
+    game.mark_board(1, 1)
+    assert game.get_square_mark(1, 1) is Q
+    assert game.next_mark() is X
+
+
+def test_full_board_has_no_next_mark():
+    game = Game([[X, Q, X], [X, Q, Q], [Q, X, X]])
+    assert game.open_squares() == set()
+    assert game.next_mark() is _
+
+
+@pytest.mark.parametrize("board,winner", [
+    ([[X, X, X, X], [Q, Q, Q, _], [_, _, _, _], [_, _, _, _]], X),
+    ([[Q, _, _, Q], [X, X, X, _], [_, _, X, _], [Q, _, _, Q]], Q),
+    ([[_, _, _, _], [_, Q, Q, X], [X, Q, Q, X], [_, _, X, _]], Q),
+    ([[X, Q, _, _], [_, X, Q, _], [_, _, X, Q], [_, _, _, X]], X),
+    ([[X, Q, _, _], [_, X, Q, _], [_, _, X, Q], [_, _, _, _]], _),
+])
+def test_supergame_winner(board, winner):
+    assert Supergame(board).winner() is winner
+
+
+def test_mark_filled_square():
+    game = Game()
+    game.mark_board(0, 0)
+    with pytest.raises(SquareFilled):
+        game.mark_board(0, 0)
+    game.mark_board(0, 0, Q, force=True)
+    assert game.get_square_mark(0, 0) is Q
+
+
+@pytest.mark.parametrize("game_type", [Game, Supergame, k_in_a_row(5, 4, True)])
+def test_incremental_state_matches_rescan(game_type):
+    for seed in range(50):
+        rng = random.Random(seed)
+        game = game_type()
+        while game.next_mark() is not Mark.NOBODY:
+            game.mark_board(*rng.choice(sorted(game.open_squares())))
+            rescanned = game_type(game.board)
+            assert game.winner() is rescanned._scan_winner()
+            assert game.open_squares() == rescanned.open_squares()
+            assert game.next_mark() is rescanned.next_mark()
+            assert game.path_counts == rescanned.path_counts
+
+
+def test_undo_mark_restores_state():
+    game = Supergame([[X, _, _, _], [_, Q, _, _], [X, _, _, _], [_, _, _, Q]])
+    before = (game.board, game.open_squares(), game.next_mark(), game.position_hash)
+    path_counts = list(game.path_counts)
+    game.mark_board(1, 0)
+    game.mark_board(3, 0)
+    game.mark_board(0, 0, Q, force=True)
+    game.undo_mark()
+    game.undo_mark()
+    game.undo_mark()
+    after = (game.board, game.open_squares(), game.next_mark(), game.position_hash)
+    assert after == before
+    assert game.path_counts == path_counts
+    assert game.winner() is _
+
+
+def test_copy_is_independent():
+    game = Game()
+    game.mark_board(1, 1)
+    clone = game.copy()
+    clone.mark_board(0, 0)
+    assert game.get_square_mark(0, 0) is _
+    assert game.next_mark() is Q
+    clone.undo_mark()
+    clone.undo_mark()
+    assert clone.open_squares() == Game().open_squares()
+
+
+def test_k_in_a_row_paths():
+    game_type = k_in_a_row(5, 4)
+    assert len(game_type.VICTORY_PATHS) == 2 * 5 * 2 + 2 * 2 * 2
+    assert all(length == 4 for length in game_type.PATH_LENGTHS)
+    assert k_in_a_row(5, 4) is game_type
+    assert k_in_a_row(5, 4, square_wins=True) is not game_type
+
+
+def test_k_in_a_row_winner():
+    game = k_in_a_row(5, 4)()
+    for row, col in [(1, 4), (0, 0), (2, 3), (0, 1), (3, 2), (0, 2), (4, 1)]:
+        game.mark_board(row, col)
+    assert game.winner() is X
+
+
+def test_supergame_is_a_variant():
+    variant = game_type_by_name("4x4-4-squares-corners")
+    assert variant is k_in_a_row(4, 4, square_wins=True, corner_wins=True)
+    assert sorted(variant.VICTORY_MASKS) == sorted(Supergame.VICTORY_MASKS)
+    with pytest.raises(ValueError):
+        game_type_by_name("4x5-4")
+
+
+def test_variants_pickle():
+    game = game_type_by_name("7x7-5")()
+    game.mark_board(3, 3)
+    clone = pickle.loads(pickle.dumps(game))
+    assert type(clone) is type(game)
+    assert clone.board == game.board
+    assert clone.next_mark() is Q
@@ -1,3 +1,5 @@
+import time
+
 import pytest
 from unittest import mock
 
@@ -24,3 +26,32 @@ def test_score_short_win_over_long_win(agent):
     ]
     game = Supergame(board)
     assert type(agent.get_move(game)) == tuple
+
+
+def test_move_arrives_within_time_cutoff(agent):
+    board = [
+        [_, _, _, _],
+        [_, X, Q, _],
+        [_, _, X, _],
+        [_, _, _, _],
+    ]
+    game = Supergame(board)
+    agent.TIME_CUTOFF = 0.5
+    start_time = time.time()
+    move = agent.get_move(game)
+    assert time.time() - start_time < agent.TIME_CUTOFF + 0.25
+    assert move in game.open_squares()
+    assert game.board == board
+
+
+def test_expired_deadline_still_gives_a_move(agent):
+    board = [
+        [_, _, _, _],
+        [_, X, Q, _],
+        [_, _, X, _],
+        [_, _, _, _],
+    ]
+    game = Supergame(board)
+    move, _score, depth = agent.search(game, deadline=time.time())
+    assert depth == 0
+    assert move in game.open_squares()
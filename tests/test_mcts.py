@@ -0,0 +1,76 @@
+from unittest import mock
+
+import pytest
+
+from tictactoe.constants import Mark
+from tictactoe.games import Game, Supergame, k_in_a_row
+from tictactoe.players import MonteCarloAI
+from tictactoe.players.mcts import peek_ahead_rollout_move
+
+X = Mark.X
+Q = Mark.O
+_ = Mark.NOBODY
+
+
+@pytest.fixture
+def agent():
+    return MonteCarloAI(mock.MagicMock(), mock.MagicMock(), playouts=2000)
+
+
+def test_takes_the_win(agent):
+    board = [
+        [X, X, X, _],
+        [Q, Q, Q, _],
+        [_, _, _, _],
+        [_, _, _, _],
+    ]
+    assert agent.get_move(Supergame(board)) == (0, 3)
+
+
+def test_blocks_the_loss(agent):
+    board = [
+        [X, _, _, _],
+        [Q, Q, Q, _],
+        [_, _, X, _],
+        [X, _, _, _],
+    ]
+    assert agent.get_move(Supergame(board)) == (1, 3)
+
+
+def test_playouts_leave_the_game_alone(agent):
+    game = Supergame([[X, _, _, _], [_, Q, _, _], [_, _, _, _], [_, _, _, _]])
+    board = game.board
+    root = agent.search(game, playouts=50)
+    assert game.board == board
+    assert root.visits == 50
+    assert sum(child.visits for child in root.children.values()) == 50
+
+
+def test_tree_is_reused_after_both_moves(agent):
+    game = Supergame()
+    move = agent.get_move(game)
+    game.mark_board(*move)
+    replies = agent.root.children[move].children
+    reply = max(replies, key=lambda m: replies[m].visits)
+    visits = replies[reply].visits
+    game.mark_board(*reply)
+    root = agent.reuse_tree(game)
+    assert root.visits == visits > 0
+    assert root.parent is None
+
+
+def test_new_tree_for_another_game_type(agent):
+    agent.get_move(Supergame())
+    assert agent.get_move(Game()) in Game().open_squares()
+    assert set(agent.root.children) == Game().open_squares()
+    agent.get_move(Supergame())
+    assert set(agent.root.children) == Supergame().open_squares()
+
+
+def test_peek_ahead_rollout_prefers_win_to_block():
+    game = k_in_a_row(5, 4)()
+    for move in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2), (1, 2)]:
+        game.mark_board(*move)
+    assert peek_ahead_rollout_move(game) == (0, 3)
+    game.mark_board(4, 4)
+    assert peek_ahead_rollout_move(game) == (1, 3)
@@ -0,0 +1,50 @@
+import multiprocessing
+from unittest import mock
+
+import pytest
+
+from tictactoe.constants import Mark
+from tictactoe.games import Game, Supergame
+from tictactoe.players import FlawlessAI, parallel
+from tictactoe.players.scores import SearchTimeout
+
+X = Mark.X
+Q = Mark.O
+_ = Mark.NOBODY
+
+
+@pytest.fixture(scope="module")
+def parallel_agent():
+    agent = FlawlessAI(mock.MagicMock(), mock.MagicMock(), workers=2)
+    yield agent
+    agent.close()
+
+
+@pytest.mark.parametrize("game,depth", [
+    (Game([[X, _, _], [_, Q, _], [_, _, _]]), 4),
+    (Supergame([[_, _, _, _], [_, X, Q, _], [_, _, X, _], [_, _, _, Q]]), 2),
+    (Supergame([[X, X, _, _], [_, X, _, _], [_, _, _, _], [Q, Q, _, _]]), 3),
+])
+def test_parallel_matches_serial(parallel_agent, game, depth):
+    serial_agent = FlawlessAI(mock.MagicMock(), mock.MagicMock())
+    assert parallel_agent.search_root(game, depth) == serial_agent.search_root(
+        game, depth
+    )
+
+
+def test_node_budget_reaches_the_workers(parallel_agent):
+    game = Supergame([[_, _, _, _], [_, X, Q, _], [_, _, X, _], [_, _, _, Q]])
+    start_nodes = parallel_agent.nodes
+    depth = parallel_agent.search(game, node_budget=300)[2]
+    assert 0 < parallel_agent.nodes - start_nodes <= 300 * 3
+    assert parallel_agent.search(game, node_budget=30000)[2] > depth
+
+
+def test_root_searches_of_an_old_generation_stop():
+    bound = multiprocessing.Array("d", [2.0, -2.0, 0.0], lock=False)
+    parallel._start_worker(FlawlessAI, None, bound, multiprocessing.Lock())
+    try:
+        with pytest.raises(SearchTimeout):
+            parallel._score_root_move(Supergame(), (0, 0), 15, 1, None, None)
+    finally:
+        parallel._worker.clear()
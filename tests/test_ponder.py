@@ -0,0 +1,68 @@
+import time
+
+import pytest
+from unittest import mock
+
+from tictactoe.constants import Mark
+from tictactoe.games import Supergame
+from tictactoe.players import FlawlessAI, RandomAI
+
+X = Mark.X
+Q = Mark.O
+_ = Mark.NOBODY
+
+
+@pytest.fixture
+def agent():
+    agent = FlawlessAI(mock.MagicMock(), mock.MagicMock())
+    agent.TIME_CUTOFF = 0.3
+    yield agent
+    agent.stop_pondering()
+
+
+@pytest.fixture
+def game():
+    board = [
+        [Q, _, _, _],
+        [_, X, Q, _],
+        [_, _, X, _],
+        [_, _, _, _],
+    ]
+    return Supergame(board)
+
+
+def test_ponder_hit_answers_at_once(agent, game):
+    game.mark_board(*agent.get_move(game))
+    expected_reply = agent.last_stats.principal_variation[1]
+    agent.ponder(game)
+    time.sleep(agent.TIME_CUTOFF + 0.1)  # The opponent thinks
+    game.mark_board(*expected_reply)
+    start_time = time.time()
+    move = agent.get_move(game)
+    assert time.time() - start_time < 0.1
+    assert move in game.open_squares()
+    assert agent.last_stats.pondered
+    assert agent.ponder_thread is None
+
+
+def test_ponder_miss_is_cancelled(agent, game):
+    board = [row[:] for row in game.board]
+    game.mark_board(*agent.get_move(game))
+    expected_reply = agent.last_stats.principal_variation[1]
+    agent.ponder(game)
+    other_reply = next(m for m in game.open_squares() if m != expected_reply)
+    game.mark_board(*other_reply)
+    move = agent.get_move(game)
+    assert move in game.open_squares()
+    assert not agent.last_stats.pondered
+    assert agent.ponder_thread is None
+    assert not agent.cancelled.is_set()
+    game.undo_mark()
+    game.undo_mark()
+    assert game.board == board
+
+
+def test_stop_pondering_without_pondering():
+    player = RandomAI(mock.MagicMock(), mock.MagicMock())
+    player.ponder(Supergame())
+    player.stop_pondering()
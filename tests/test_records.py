@@ -0,0 +1,98 @@
+import io
+
+import pytest
+
+from tictactoe.constants import Mark
+from tictactoe.games import Game, Supergame
+from tictactoe.records import (
+    FILE_HEADER,
+    GameRecord,
+    RecordReader,
+    RecordWriter,
+    read_text,
+    write_text,
+)
+
+X = Mark.X
+Q = Mark.O
+_ = Mark.NOBODY
+
+
+@pytest.fixture
+def records():
+    return [
+        GameRecord(
+            "game", "flawless", "random", X, [(1, 1), (0, 1), (0, 0), (2, 1), (2, 2)]
+        ),
+        GameRecord(
+            "supergame",
+            "peek_ahead",
+            "mcts",
+            Mark.NOBODY,
+            [(row, col) for row in (0, 2, 1, 3) for col in (0, 1, 2, 3)],
+        ),
+        GameRecord("supergame", "", "", Q, []),
+    ]
+
+
+def test_moves_take_a_nibble_each(records):
+    packed = records[0].pack()
+    assert len(packed) == 5 + len("flawless") + len("random") + 3
+
+
+def test_records_survive_a_file(records, tmp_path):
+    path = tmp_path / "games.ttr"
+    with RecordWriter(path) as writer:
+        writer.write(records[0])
+    with RecordWriter(path) as writer:
+        for record in records[1:]:
+            writer.write(record)
+    with RecordReader(path) as reader:
+        assert list(reader) == records
+
+
+def test_unfinished_record_is_skipped(records, tmp_path):
+    path = tmp_path / "games.ttr"
+    with RecordWriter(path) as writer:
+        for record in records[:2]:
+            writer.write(record)
+    path.write_bytes(path.read_bytes()[:-2])
+    with RecordReader(path) as reader:
+        assert list(reader) == records[:1]
+
+
+def test_other_files_are_refused(tmp_path):
+    path = tmp_path / "games.txt"
+    path.write_bytes(b"not a record file")
+    with pytest.raises(ValueError):
+        RecordReader(path)
+    with pytest.raises(ValueError):
+        RecordWriter(path)
+    assert FILE_HEADER.size == 8
+
+
+def test_text_round_trip(records):
+    stream = io.StringIO()
+    assert write_text(records, stream) == len(records)
+    stream.seek(0)
+    assert list(read_text(stream)) == records
+
+
+def test_replay_rebuilds_the_game():
+    moves = [(1, 1), (2, 2), (1, 2), (0, 0), (1, 0)]
+    game = Supergame()
+    for move in moves:
+        game.mark_board(*move)
+    record = GameRecord("supergame", "a", "b", game.winner(), moves)
+    replayed = GameRecord.unpack_from(record.pack())[0].replay()
+    assert replayed.board == game.board
+    assert (replayed.x_bits, replayed.o_bits) == (game.x_bits, game.o_bits)
+    assert replayed.position_hash == game.position_hash
+    assert replayed.path_counts == game.path_counts
+    assert replayed.winner() is game.winner()
+
+
+def test_only_small_boards_are_recorded():
+    with pytest.raises(ValueError):
+        GameRecord("5x5-4", "a", "b", X, [(4, 4)]).pack()
+    assert GameRecord("game", "a", "b", X, []).replay().board == Game().board
@@ -4,6 +4,7 @@ from unittest import mock
 from tictactoe.constants import Mark
 from tictactoe.games import Supergame
 from tictactoe.players import FlawlessAI
+from tictactoe.players.evaluation import evaluate_children, squash
 
 X = Mark.X
 Q = Mark.O
@@ -153,3 +154,51 @@ def test_score_short_win_over_long_win(agent):
     ]
     game = Supergame(board)
     assert agent.score_move(game, (1, 0), 3) > agent.score_move(game, (0, 2), 3)
+
+
+def test_children_evaluated_in_one_pass(agent):
+    board = [
+        [X, X, X, _],
+        [Q, Q, _, _],
+        [_, Q, _, _],
+        [_, _, _, _],
+    ]
+    game = Supergame(board)
+    moves = sorted(game.open_squares())
+    for move, state_score in zip(moves, evaluate_children(game, moves)):
+        game.mark_board(*move)
+        if move == (0, 3):
+            assert state_score is None
+        else:
+            assert state_score == agent.score_game_state(game)
+        game.undo_mark()
+
+
+def test_analysis_scores_every_move_exactly(agent):
+    board = [
+        [X, _, _, _],
+        [_, X, Q, _],
+        [_, _, Q, _],
+        [_, _, _, _],
+    ]
+    game = Supergame(board)
+    scores, depth = agent.analyze(game, 3)
+    assert depth == 3
+    assert set(scores) == game.open_squares()
+    assert list(scores.values()) == sorted(scores.values(), reverse=True)
+    for move, score in scores.items():
+        fresh_agent = FlawlessAI(mock.MagicMock(), mock.MagicMock())
+        assert fresh_agent.score_move(game, move, 3) == score
+    assert game.board == board
+
+
+def test_analysis_stops_at_deadline(agent):
+    game = Supergame([[X, _, _, _], [_, X, Q, _], [_, _, Q, _], [_, _, _, _]])
+    scores, depth = agent.analyze(game, deadline=0.0)
+    assert depth == 0
+    assert set(scores) == game.open_squares()
+
+
+def test_heuristic_never_claims_a_win():
+    assert -1 < squash(-1000) < squash(-20) < 0 < squash(20) < squash(1000) < 1
+    assert squash(40) == squash(1000) == -squash(-1000)
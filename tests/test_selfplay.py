@@ -0,0 +1,59 @@
+import random
+from itertools import islice
+from unittest import mock
+
+import pytest
+
+from tictactoe.constants import Mark
+from tictactoe.games import Game
+from tictactoe.players import FlawlessAI, RandomAI
+from tictactoe.selfplay import (
+    chunk_path,
+    generate,
+    labelled_positions,
+    read_chunk,
+    read_samples,
+)
+
+
+@pytest.fixture
+def settings():
+    return {
+        "game": "game",
+        "chunk_size": 12,
+        "depth": 2,
+        "opening_plies": 2,
+        "player": None,
+        "seed": 7,
+    }
+
+
+def test_positions_are_labelled_with_open_squares():
+    labeller = FlawlessAI(mock.MagicMock(), mock.MagicMock())
+    player = RandomAI(mock.MagicMock(), mock.MagicMock())
+    samples = labelled_positions(Game, labeller, 2, 1, random.Random(0), player)
+    for sample in islice(samples, 30):
+        row, col = sample.move
+        square = 1 << row * Game.SIZE + col
+        assert not square & (sample.x_bits | sample.o_bits)
+        x_count, o_count = bin(sample.x_bits).count("1"), bin(sample.o_bits).count("1")
+        assert sample.next_mark is (Mark.X if x_count == o_count else Mark.O)
+        assert -1.0 <= sample.score <= 1.0
+
+
+def test_chunks_are_remade_the_same(settings, tmp_path):
+    assert list(generate(tmp_path, settings, 3, 2)) == [(0, 12), (1, 12), (2, 12)]
+    chunk = chunk_path(tmp_path, 1)
+    contents = chunk.read_bytes()
+    chunk.unlink()
+    assert list(generate(tmp_path, settings, 4, 2)) == [(1, 12), (3, 12)]
+    assert chunk.read_bytes() == contents
+    assert len(list(read_chunk(chunk))) == 12
+    assert len(list(read_samples(tmp_path))) == 48
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_other_settings_are_refused(settings, tmp_path):
+    list(generate(tmp_path, settings, 1, 1))
+    with pytest.raises(ValueError):
+        list(generate(tmp_path, dict(settings, depth=3), 1, 1))
@@ -0,0 +1,89 @@
+import asyncio
+import errno
+from unittest import mock
+
+from tictactoe import loadgen
+from tictactoe.games import Game, Supergame
+from tictactoe.players import RandomAI, silent_listener, silent_speaker
+from tictactoe.server import GameServer, _local_players, _pooled_move
+
+
+async def serving(test):
+    game_server = GameServer()
+    server = await game_server.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        return await asyncio.wait_for(test(port), 10)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+async def converse(port, lines):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    replies = [(await reader.readline()).decode().strip()]
+    for line, reply_count in lines:
+        writer.write(f"{line}\n".encode())
+        for _ in range(reply_count):
+            replies.append((await reader.readline()).decode().strip())
+    writer.close()
+    return replies
+
+
+def test_human_against_computer():
+    async def test(port):
+        return await converse(
+            port,
+            [
+                ("NEW game human random", 2),
+                ("MOVE 9 9", 1),
+                ("JUMP", 1),
+                ("MOVE 1 1", 2),
+            ],
+        )
+
+    replies = asyncio.run(serving(test))
+    assert replies[:3] == ["HELLO tictactoe 1", "GAME game 3 X", "YOUR_MOVE X"]
+    assert replies[3].startswith("ERROR")
+    assert replies[4].startswith("ERROR")
+    assert replies[5] == "MOVED X 1 1"
+    assert replies[6].startswith("MOVED O")
+
+
+def test_unknown_player_is_an_error():
+    async def test(port):
+        return await converse(port, [("NEW game human nobody", 1), ("STATS", 1)])
+
+    replies = asyncio.run(serving(test))
+    assert replies[1].startswith("ERROR Unknown player")
+    assert replies[2] == "STATS 1 0"
+
+
+def test_load_generator_plays_every_session():
+    async def test(port):
+        return await loadgen.run_load("127.0.0.1", port, 20, 10)
+
+    report = asyncio.run(serving(test))
+    assert (report.games, report.errors) == (20, 0)
+    assert report.peak_sessions == 10
+    assert len(report.latencies) == report.moves
+
+
+def test_players_move_without_blocking_the_loop():
+    player = RandomAI(silent_speaker, silent_listener)
+    move = asyncio.run(player.get_move_async(Game()))
+    assert move in Game().open_squares()
+
+
+def test_pooled_players_are_kept_per_game_type():
+    assert _pooled_move("mcts", 0.05, Supergame()) in Supergame().open_squares()
+    assert _pooled_move("mcts", 0.05, Game()) in Game().open_squares()
+    game_types = {key[1] for key in _local_players.players if key[0] == "mcts"}
+    assert game_types == {Supergame, Game}
+
+
+def test_load_generator_counts_socket_failures():
+    too_many_files = OSError(errno.EMFILE, "Too many open files")
+    with mock.patch("asyncio.open_connection", side_effect=too_many_files):
+        report = asyncio.run(loadgen.run_load("127.0.0.1", 1, 3, 2))
+    assert (report.games, report.errors) == (0, 3)
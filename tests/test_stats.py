@@ -0,0 +1,67 @@
+import io
+import json
+from unittest import mock
+
+import pytest
+
+from tictactoe import arena
+from tictactoe.constants import Mark
+from tictactoe.games import Supergame
+from tictactoe.players import FlawlessAI, json_lines_writer
+
+X = Mark.X
+Q = Mark.O
+_ = Mark.NOBODY
+
+
+@pytest.fixture
+def agent():
+    return FlawlessAI(mock.MagicMock(), mock.MagicMock())
+
+
+@pytest.fixture
+def game():
+    board = [
+        [_, _, _, _],
+        [_, X, Q, _],
+        [_, _, X, _],
+        [_, _, _, Q],
+    ]
+    return Supergame(board)
+
+
+def test_search_records_each_iteration(agent, game):
+    move, score, depth = agent.search(game, max_depth=3)
+    stats = agent.last_stats
+    assert (stats.move, stats.score, stats.depth) == (move, score.score, depth)
+    assert [iteration.depth for iteration in stats.iterations] == [0, 1, 2, 3]
+    assert all(iteration.completed for iteration in stats.iterations)
+    assert sum(iteration.nodes for iteration in stats.iterations) == stats.nodes
+    assert stats.principal_variation[0] == move
+    assert stats.cutoffs > 0
+    assert stats.table_hits + stats.table_misses > 0
+
+
+def test_timed_out_iteration_is_marked_incomplete(agent, game):
+    agent.search(game, deadline=0)
+    stats = agent.last_stats
+    assert stats.depth == 0
+    assert [iteration.completed for iteration in stats.iterations] == [True, False]
+
+
+def test_get_move_streams_json_lines(agent, game):
+    stream = io.StringIO()
+    agent.stats_callback = json_lines_writer(stream)
+    agent.TIME_CUTOFF = 0.2
+    move = agent.get_move(game)
+    record = json.loads(stream.getvalue())
+    assert tuple(record["move"]) == move
+    assert record["iterations"]
+
+
+def test_arena_summarizes_search_stats():
+    result = arena._play_match(("game", "flawless", "random", 0.05, 0))
+    assert Mark.X in result.stats and Mark.O not in result.stats
+    summary = arena.search_summary([result])
+    assert list(summary) == ["flawless"]
+    assert summary["flawless"]["nodes"] > 0
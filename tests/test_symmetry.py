@@ -0,0 +1,49 @@
+import pytest
+
+from tictactoe.constants import Mark
+from tictactoe.games import Game, Supergame, Symmetry, canonical_key
+from tictactoe.games.symmetry import game_symmetries
+
+X = Mark.X
+Q = Mark.O
+_ = Mark.NOBODY
+
+
+@pytest.mark.parametrize("symmetry", list(Symmetry))
+def test_inverse_undoes_symmetry(symmetry):
+    for address in [(0, 0), (0, 1), (1, 3), (2, 1)]:
+        assert symmetry.inverse.apply(symmetry.apply(address, 4), 4) == address
+
+
+@pytest.mark.parametrize("symmetry", list(Symmetry))
+def test_bits_follow_board(symmetry):
+    board = [
+        [X, Q, _, _],
+        [_, X, _, _],
+        [_, _, _, Q],
+        [X, _, _, _],
+    ]
+    game = Supergame(board)
+    moved = Supergame(symmetry.apply_to_board(board))
+    assert symmetry.apply_to_bits(game.x_bits, 4) == moved.x_bits
+    assert symmetry.apply_to_bits(game.o_bits, 4) == moved.o_bits
+
+
+def test_symmetric_positions_share_a_key():
+    board = [[X, _, _], [_, Q, _], [_, _, _]]
+    keys = {canonical_key(Game(s.apply_to_board(board)))[0] for s in Symmetry}
+    assert len(keys) == 1
+
+
+def test_moves_map_back_through_inverse():
+    game = Supergame([[_, _, _, _], [_, _, _, _], [_, _, _, X], [_, _, _, _]])
+    key, symmetry = canonical_key(game)
+    canonical_game = Supergame(symmetry.apply_to_board(game.board))
+    assert (canonical_game.x_bits, canonical_game.o_bits) == key
+    canonical_move = symmetry.apply((1, 1), 4)
+    assert symmetry.inverse.apply(canonical_move, 4) == (1, 1)
+
+
+@pytest.mark.parametrize("game_type", [Game, Supergame])
+def test_classic_games_have_all_symmetries(game_type):
+    assert len(game_symmetries(game_type())) == 8
@@ -0,0 +1,60 @@
+from unittest import mock
+
+import pytest
+
+from tictactoe import tablebase
+from tictactoe.constants import Mark
+from tictactoe.games import Game
+from tictactoe.players import FlawlessAI
+
+X = Mark.X
+Q = Mark.O
+_ = Mark.NOBODY
+
+
+@pytest.fixture
+def game_tablebase(tmp_path, monkeypatch):
+    monkeypatch.setattr(tablebase, "TABLEBASE_DIRECTORY", tmp_path)
+    return tablebase.build_tablebase(
+        "game", tablebase.tablebase_path(Game), report=lambda message: None
+    )
+
+
+def test_empty_board_is_a_draw(game_tablebase):
+    assert game_tablebase.probe(Game()) == (tablebase.DRAW, 9)
+
+
+def test_move_values(game_tablebase):
+    game = Game([[X, X, _], [Q, Q, _], [_, _, _]])
+    values = game_tablebase.move_values(game)
+    assert values[(0, 2)] == (tablebase.WIN, 0)
+    assert values[(2, 2)] == (tablebase.LOSS, 1)
+    assert game_tablebase.best_move(game) == ((0, 2), tablebase.WIN, 0)
+
+
+def test_agent_plays_perfect_move(game_tablebase):
+    agent = FlawlessAI(mock.MagicMock(), mock.MagicMock())
+    game = Game([[X, _, _], [_, Q, _], [_, _, X]])
+    assert agent.tablebase_move(game) in {(0, 1), (1, 0), (1, 2), (2, 1)}
+
+
+def test_interrupted_build_resumes(game_tablebase, tmp_path):
+    solved = bytes(game_tablebase.data)
+    game_tablebase.finish_layer(5)
+    path = tablebase.tablebase_path(Game)
+    resumed = tablebase.build_tablebase("game", path, report=lambda message: None)
+    assert resumed.complete
+    assert bytes(resumed.data) == solved
+
+
+def test_unreachable_positions_stay_unknown(game_tablebase):
+    both_won = Game([[X, X, X], [Q, Q, Q], [X, _, _]])
+    played_on = Game([[X, X, X], [Q, Q, _], [Q, _, _]])
+    for game in (both_won, played_on):
+        assert game_tablebase.probe(game)[0] == tablebase.UNKNOWN
+    won = Game([[X, X, X], [Q, Q, _], [_, _, _]])
+    assert game_tablebase.probe(won) == (tablebase.LOSS, 0)
+    # Two paths completed with no square in common take two winning moves
+    paths, o_bits = (0b111, 0b111000), 0b11111000000
+    assert not tablebase.is_reachable(paths, 0b111111, o_bits)
+    assert tablebase.is_reachable((0b111, 0b100100100), 0b100100111, 0b11011000)
@@ -0,0 +1,61 @@
+import random
+from unittest import mock
+
+import pytest
+
+from tictactoe.constants import Mark
+from tictactoe.games import Supergame, k_in_a_row
+from tictactoe.players import PeekAheadAI
+from tictactoe.players.threats import ThreatIndex
+
+
+def brute_force_wins(game, mark):
+    wins = set()
+    for square in game.open_squares():
+        game.mark_board(*square, mark=mark)
+        if game.winner() is mark:
+            wins.add(square)
+        game.undo_mark()
+    return wins
+
+
+@pytest.mark.parametrize("game_type", [Supergame, k_in_a_row(7, 5)])
+def test_index_follows_moves_and_undos(game_type):
+    rng = random.Random(3)
+    index = ThreatIndex()
+    for _ in range(20):
+        game = game_type()
+        while game.winner() is Mark.NOBODY and game.open_squares():
+            marks = game.mark_counts[Mark.X] + game.mark_counts[Mark.O]
+            if marks and rng.random() < 0.2:
+                game.undo_mark()
+            else:
+                game.mark_board(*rng.choice(sorted(game.open_squares())))
+            index.update(game)
+            if game.winner() is not Mark.NOBODY:
+                continue
+            for mark in (Mark.X, Mark.O):
+                assert set(index.squares[mark]) == brute_force_wins(game, mark)
+
+
+def test_index_catches_up_after_many_moves():
+    game = Supergame()
+    index = ThreatIndex()
+    index.update(game)
+    for move in [(0, 0), (1, 0), (0, 1), (1, 1), (3, 3), (1, 3)]:
+        game.mark_board(*move)
+    index.update(game)
+    assert index.winning_square(Mark.X) is None
+    assert index.winning_square(Mark.O) == (1, 2)
+    index.update(k_in_a_row(5, 4)())
+    assert index.winning_square(Mark.O) is None
+
+
+def test_peek_ahead_wins_before_blocking():
+    agent = PeekAheadAI(mock.MagicMock(), mock.MagicMock())
+    game = k_in_a_row(5, 4)()
+    for move in [(0, 0), (1, 0), (0, 1), (1, 1), (0, 2), (1, 2)]:
+        game.mark_board(*move)
+    assert agent.get_move(game) == (0, 3)
+    game.mark_board(4, 4)
+    assert agent.get_move(game) == (1, 3)
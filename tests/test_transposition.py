@@ -0,0 +1,62 @@
+from unittest import mock
+
+from tictactoe.constants import Mark
+from tictactoe.games import Supergame, k_in_a_row
+from tictactoe.players import FlawlessAI
+from tictactoe.players.flawless import MoveScore
+from tictactoe.players.transposition import Bound, TableEntry, TranspositionTable
+
+X = Mark.X
+Q = Mark.O
+_ = Mark.NOBODY
+
+
+def test_position_hash_is_order_independent():
+    game_a, game_b = Supergame(), Supergame()
+    for move in [(0, 0), (1, 1), (2, 2)]:
+        game_a.mark_board(*move)
+    for move in [(2, 2), (1, 1), (0, 0)]:
+        game_b.mark_board(*move, Mark.X if move != (1, 1) else Mark.O)
+    assert game_a.position_hash == game_b.position_hash
+    assert game_a.position_hash == Supergame(game_a.board).position_hash
+
+
+def test_table_evicts_least_recently_used():
+    table = TranspositionTable(max_entries=2)
+    for key in range(3):
+        table.store(key, TableEntry(MoveScore(0.0, 0), 1, Bound.EXACT))
+        table.get(0)
+    assert len(table) == 2
+    assert table.get(1) is None
+    assert table.get(0) is not None
+    assert table.evictions == 1
+    assert (table.hits, table.misses) == (4, 1)
+
+
+def test_search_reuses_transpositions():
+    agent = FlawlessAI(mock.MagicMock(), mock.MagicMock())
+    board = [
+        [X, _, _, _],
+        [_, Q, _, _],
+        [_, _, X, _],
+        [_, _, _, Q],
+    ]
+    game = Supergame(board)
+    agent.score_move(game, (0, 3), 4)
+    assert agent.transposition_table.hits > 0
+
+
+def test_same_size_variants_do_not_share_entries():
+    board = [
+        [X, _, _, _],
+        [_, Q, _, _],
+        [_, _, X, Q],
+        [_, _, _, _],
+    ]
+    assert Supergame(board).position_hash != k_in_a_row(4, 3)(board).position_hash
+    agent = FlawlessAI(mock.MagicMock(), mock.MagicMock())
+    agent.analyze(k_in_a_row(4, 3)(board), 3)
+    fresh_agent = FlawlessAI(mock.MagicMock(), mock.MagicMock())
+    assert agent.analyze(Supergame(board), 3) == fresh_agent.analyze(
+        Supergame(board), 3
+    )
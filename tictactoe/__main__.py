@@ -1,9 +1,22 @@
 from curses import wrapper
-from typing import Dict, Type
+import time
+from typing import Callable, Dict, Type
 
-from tictactoe.constants import Mark, SquareFilled
-from tictactoe.games import BaseGame, Game, Supergame
-from tictactoe.players import FlawlessAI, Human, PeekAheadAI, Player, RandomAI
+from tictactoe.constants import Address, Mark, SquareFilled
+from tictactoe.games import BaseGame, Game, Supergame, k_in_a_row
+from tictactoe.players import (
+    FlawlessAI,
+    Human,
+    MonteCarloAI,
+    PeekAheadAI,
+    Player,
+    RandomAI,
+    silent_listener,
+    silent_speaker,
+)
+from tictactoe.players.scores import MoveScore
+
+HINT_SECONDS = 1
 
 
 def main(stdscr):
@@ -15,6 +28,10 @@ def main(stdscr):
         Mark.X: player_x_type(speaker=stdscr.addstr, listener=stdscr.getkey),
         Mark.O: player_o_type(speaker=stdscr.addstr, listener=stdscr.getkey),
     }
+    advisor = make_advisor(stdscr)
+    for player in players.values():
+        if isinstance(player, Human):
+            player.advisor = advisor
     next_mark = game.next_mark()
     winner = game.winner()
     stdscr.clear()
@@ -35,8 +52,16 @@ def main(stdscr):
             else:
                 raise
         stdscr.addstr(display_game(game, players) + "\n")
+        stats = getattr(current_player, "last_stats", None)
+        if stats is not None:
+            stdscr.addstr(stats.summary() + "\n")
         next_mark = game.next_mark()
         winner = game.winner()
+        if winner is Mark.NOBODY and type(players.get(next_mark)) == Human:
+            # Think on the human's time
+            current_player.ponder(game)
+    for player in players.values():
+        player.stop_pondering()
     if winner is not Mark.NOBODY:
         stdscr.addstr(f"The winner is {players[winner]}!\n")
     else:
@@ -45,7 +70,7 @@ def main(stdscr):
 
 
 def ask_game_type(stdscr) -> Type[BaseGame]:
-    game_choices = [Game, Supergame]
+    game_choices = [Game, Supergame, k_in_a_row(5, 4), k_in_a_row(7, 5)]
     stdscr.addstr("What kind of game do you want to play?\n")
     for i, game in enumerate(game_choices):
         stdscr.addstr(f"{i}: {game.NAME}\n")
@@ -56,7 +81,7 @@ def ask_game_type(stdscr) -> Type[BaseGame]:
 
 
 def ask_player_type(stdscr, player_name: str) -> Type[Player]:
-    player_choices = [Human, RandomAI, PeekAheadAI, FlawlessAI]
+    player_choices = [Human, RandomAI, PeekAheadAI, FlawlessAI, MonteCarloAI]
     stdscr.addstr(f"Who will be {player_name}?\n")
     for i, player in enumerate(player_choices):
         stdscr.addstr(f"{i}: {player.NAME}\n")
@@ -66,6 +91,55 @@ def ask_player_type(stdscr, player_name: str) -> Type[Player]:
     return player_choices[int(answer)]
 
 
+def make_advisor(window) -> Callable[[BaseGame], str]:
+    """Hints for a human: every open square scored by a short analysis."""
+    agent = FlawlessAI(silent_speaker, silent_listener)
+
+    def advise(game: BaseGame) -> str:
+        scores, depth = agent.analyze(game, deadline=time.time() + HINT_SECONDS)
+        return clip_to_window(window, display_analysis(game, scores, depth))
+
+    return advise
+
+
+def clip_to_window(window, text: str, rows_after: int = 1) -> str:
+    """As much of text as fits below the cursor, leaving rows_after rows free.
+
+    Writing past the edge of a curses window raises an error, so long lines
+    are cut short and rows that would not fit are left out.
+    """
+    height, width = window.getmaxyx()
+    row, _ = window.getyx()
+    lines = [line[: width - 1] for line in text.split("\n")]
+    return "\n".join(lines[: max(height - row - 1 - rows_after, 0)])
+
+
+def display_analysis(
+    game: BaseGame, scores: Dict[Address, MoveScore], depth: int
+) -> str:
+    rows = []
+    for row in range(game.SIZE):
+        cells = [
+            format_score(scores[(row, col)])
+            if (row, col) in scores
+            else str(game.get_square_mark(row, col))
+            for col in range(game.SIZE)
+        ]
+        rows.append("|".join(f"{cell:^7}" for cell in cells))
+    return (
+        f"Looking {depth + 1} moves ahead (W2 wins in 2 moves, L1 loses next move):\n"
+        + "\n".join(rows)
+    )
+
+
+def format_score(score: MoveScore) -> str:
+    if score.score == 1:
+        return f"W{score.depth // 2 + 1}"
+    elif score.score == -1:
+        return f"L{(score.depth + 1) // 2}"
+    return f"{score.score + 0.0:+.2f}"  # Adding 0.0 turns -0.0 into 0.0
+
+
 def display_game(game: Game, players: Dict[Mark, Player]) -> str:
     header = f"X: {players[Mark.X]}\nO: {players[Mark.O]}"
     board = f"\n{'+'.join('-' for _ in range(game.SIZE))}\n".join(
@@ -0,0 +1,326 @@
+"""Headless bulk matches between computer players.
+
+Every pair of players meets the same number of times with each taking X in
+turn, spread across a process pool. Players run with a silent speaker and
+listener, so nothing waits on a keypress. For example:
+
+    python -m tictactoe.arena --game supergame --games 200 \\
+        --players random peek_ahead flawless --time-cutoff 0.1
+"""
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import combinations
+import json
+import math
+import multiprocessing
+from pathlib import Path
+import random
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Type
+
+from tictactoe.constants import Address, Mark
+from tictactoe.games import BaseGame, game_type_by_name
+from tictactoe.players import (
+    Player,
+    SearchStats,
+    computer_player_type_by_name,
+    silent_listener,
+    silent_speaker,
+)
+from tictactoe.records import VARIANTS, GameRecord, RecordWriter
+
+
+@dataclass
+class MatchResult:
+    x_player: str
+    o_player: str
+    winner: Mark
+    moves: List[Address]
+    seconds: float
+    # Per-move search statistics from players that report them
+    stats: Dict[Mark, List[SearchStats]] = field(default_factory=dict)
+
+    def points(self, player: str) -> float:
+        """1 for a win, a half for a draw and nothing for a loss."""
+        if self.winner is Mark.NOBODY:
+            return 0.5
+        winning_player = self.x_player if self.winner is Mark.X else self.o_player
+        return 1.0 if winning_player == player else 0.0
+
+
+def play_game(
+    game: BaseGame, players: Dict[Mark, Player]
+) -> Tuple[Mark, List[Address]]:
+    """Play a game to the end without a screen, returning the winner and moves."""
+    moves = []
+    next_mark = game.next_mark()
+    while game.winner() is Mark.NOBODY and next_mark is not Mark.NOBODY:
+        move = players[next_mark].get_move(game)
+        game.mark_board(*move)
+        moves.append(move)
+        next_mark = game.next_mark()
+    return game.winner(), moves
+
+
+def make_player(player_type: Type[Player], time_cutoff: Optional[float]) -> Player:
+    player = player_type(silent_speaker, silent_listener)
+    if time_cutoff is not None and hasattr(player, "TIME_CUTOFF"):
+        player.TIME_CUTOFF = time_cutoff  # type: ignore
+    return player
+
+
+def _play_match(
+    task: Tuple[str, str, str, Optional[float], int]
+) -> MatchResult:
+    game_name, x_name, o_name, time_cutoff, seed = task
+    random.seed(seed)
+    players = {
+        Mark.X: make_player(computer_player_type_by_name(x_name), time_cutoff),
+        Mark.O: make_player(computer_player_type_by_name(o_name), time_cutoff),
+    }
+    stats: Dict[Mark, List[SearchStats]] = {}
+    for mark, player in players.items():
+        if hasattr(player, "stats_callback"):
+            player.stats_callback = stats.setdefault(mark, []).append  # type: ignore
+    start_time = time.time()
+    winner, moves = play_game(game_type_by_name(game_name)(), players)
+    return MatchResult(
+        x_name, o_name, winner, moves, time.time() - start_time, stats
+    )
+
+
+def schedule(
+    game_name: str,
+    player_names: List[str],
+    games: int,
+    time_cutoff: Optional[float],
+    seed: int,
+) -> Iterator[Tuple[str, str, str, Optional[float], int]]:
+    """Each pair of players meets games times, swapping X and O every game."""
+    match_number = 0
+    for first, second in combinations(player_names, 2):
+        for i in range(games):
+            x_name, o_name = (first, second) if i % 2 == 0 else (second, first)
+            yield game_name, x_name, o_name, time_cutoff, seed + match_number
+            match_number += 1
+
+
+def run_arena(
+    game_name: str,
+    player_names: List[str],
+    games: int,
+    workers: int,
+    time_cutoff: Optional[float] = None,
+    seed: int = 0,
+) -> Iterator[MatchResult]:
+    """Play every scheduled match, raising ValueError for unusable players."""
+    for name in player_names:
+        computer_player_type_by_name(name)
+    tasks = schedule(game_name, player_names, games, time_cutoff, seed)
+    with ProcessPoolExecutor(workers) as executor:
+        yield from executor.map(_play_match, tasks, chunksize=8)
+
+
+def tally(results: Iterable[MatchResult]) -> Dict[str, List[int]]:
+    """Wins, draws and losses for each player."""
+    records: Dict[str, List[int]] = defaultdict(lambda: [0, 0, 0])
+    for result in results:
+        for player in (result.x_player, result.o_player):
+            points = result.points(player)
+            if points == 1.0:
+                records[player][0] += 1
+            elif points == 0.5:
+                records[player][1] += 1
+            else:
+                records[player][2] += 1
+    return dict(records)
+
+
+def elo_ratings(
+    results: Iterable[MatchResult], iterations: int = 200
+) -> Dict[str, float]:
+    """Fit Bradley-Terry strengths to the results and express them as Elo.
+
+    Every pair gets one extra virtual draw, so a player who never scores
+    still has a finite rating. Ratings average 1500.
+    """
+    points: Dict[str, float] = defaultdict(float)
+    meetings: Dict[Tuple[str, str], int] = defaultdict(int)
+    for result in results:
+        pair = tuple(sorted((result.x_player, result.o_player)))
+        meetings[pair] += 1  # type: ignore
+        points[result.x_player] += result.points(result.x_player)
+        points[result.o_player] += result.points(result.o_player)
+    players = sorted(points)
+    for first, second in combinations(players, 2):
+        meetings[(first, second)] += 1
+        points[first] += 0.5
+        points[second] += 0.5
+
+    strengths = {player: 1.0 for player in players}
+    for _ in range(iterations):
+        new_strengths = {}
+        for player in players:
+            denominator = 0.0
+            for (first, second), count in meetings.items():
+                if player == first:
+                    opponent = second
+                elif player == second:
+                    opponent = first
+                else:
+                    continue
+                denominator += count / (strengths[player] + strengths[opponent])
+            new_strengths[player] = points[player] / denominator
+        scale = math.exp(
+            sum(math.log(strength) for strength in new_strengths.values())
+            / len(players)
+        )
+        strengths = {player: s / scale for player, s in new_strengths.items()}
+    return {
+        player: 1500 + 400 * math.log10(strength)
+        for player, strength in strengths.items()
+    }
+
+
+def search_summary(results: Iterable[MatchResult]) -> Dict[str, Dict[str, float]]:
+    """Totals and averages of the search statistics for each reporting player."""
+    records: Dict[str, List[SearchStats]] = defaultdict(list)
+    for result in results:
+        for mark, stats in result.stats.items():
+            player = result.x_player if mark is Mark.X else result.o_player
+            records[player] += [record for record in stats if record.iterations]
+    summary = {}
+    for player, stats in records.items():
+        if not stats:
+            continue
+        nodes = sum(record.nodes for record in stats)
+        seconds = sum(record.seconds for record in stats)
+        hits = sum(record.table_hits for record in stats)
+        lookups = hits + sum(record.table_misses for record in stats)
+        summary[player] = {
+            "searches": len(stats),
+            "mean_depth": sum(record.depth for record in stats) / len(stats),
+            "nodes": nodes,
+            "nodes_per_second": nodes / seconds if seconds else 0.0,
+            "cutoffs": sum(record.cutoffs for record in stats),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+    return summary
+
+
+def format_report(results: List[MatchResult], seconds: float) -> str:
+    records = tally(results)
+    ratings = elo_ratings(results)
+    lines = [
+        f"{len(results)} games in {seconds:.1f}s "
+        f"({len(results) / seconds if seconds else 0:.1f} games/sec)",
+        "",
+        f"{'player':<14} {'W':>6} {'D':>6} {'L':>6} {'Elo':>7}",
+    ]
+    for player in sorted(ratings, key=ratings.get, reverse=True):  # type: ignore
+        wins, draws, losses = records[player]
+        lines.append(
+            f"{player:<14} {wins:>6} {draws:>6} {losses:>6} {ratings[player]:>7.0f}"
+        )
+
+    pairings: Dict[Tuple[str, str], List[int]] = defaultdict(lambda: [0, 0, 0])
+    for result in results:
+        pairing = pairings[(result.x_player, result.o_player)]
+        pairing[[Mark.X, Mark.NOBODY, Mark.O].index(result.winner)] += 1
+    lines += ["", f"{'X':<14} {'O':<14} {'X wins':>7} {'draws':>7} {'O wins':>7}"]
+    for (x_player, o_player), (x_wins, draws, o_wins) in sorted(pairings.items()):
+        lines.append(
+            f"{x_player:<14} {o_player:<14} {x_wins:>7} {draws:>7} {o_wins:>7}"
+        )
+
+    summary = search_summary(results)
+    if summary:
+        lines += [
+            "",
+            f"{'searcher':<14} {'moves':>6} {'depth':>6} {'nodes/sec':>10} "
+            f"{'cutoffs':>9} {'hit rate':>9}",
+        ]
+        for player, totals in sorted(summary.items()):
+            lines.append(
+                f"{player:<14} {totals['searches']:>6.0f} {totals['mean_depth']:>6.1f} "
+                f"{totals['nodes_per_second']:>10.0f} {totals['cutoffs']:>9.0f} "
+                f"{totals['hit_rate']:>9.1%}"
+            )
+    return "\n".join(lines)
+
+
+def write_stats(stream: TextIO, game_number: int, result: MatchResult) -> None:
+    for mark, stats in result.stats.items():
+        player = result.x_player if mark is Mark.X else result.o_player
+        for record in stats:
+            line = {"game": game_number, "player": player, "mark": mark.name}
+            line.update(record.to_dict())
+            stream.write(json.dumps(line) + "\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play computer players off.")
+    parser.add_argument("--game", default="supergame", help="game or supergame")
+    parser.add_argument(
+        "--players", nargs="+", default=["random", "peek_ahead", "flawless"]
+    )
+    parser.add_argument("--games", type=int, default=100, help="games per pairing")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument(
+        "--time-cutoff", type=float, help="seconds per move for searching players"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--stats-log",
+        type=argparse.FileType("w"),
+        help="file to write search stats to as JSON lines",
+    )
+    parser.add_argument(
+        "--record", type=Path, help="game record file to append every game to"
+    )
+    args = parser.parse_args()
+
+    if len(args.players) < 2:
+        parser.error("at least two players are needed")
+    for name in args.players:
+        try:
+            computer_player_type_by_name(name)
+        except ValueError as error:
+            parser.error(str(error))
+    if args.record and args.game.lower() not in VARIANTS:
+        parser.error(f"only {' and '.join(VARIANTS)} games can be recorded")
+    recorder = RecordWriter(args.record) if args.record else None
+    start_time = time.time()
+    results = []
+    for game_number, result in enumerate(
+        run_arena(
+            args.game,
+            args.players,
+            args.games,
+            args.workers,
+            args.time_cutoff,
+            args.seed,
+        )
+    ):
+        results.append(result)
+        if args.stats_log:
+            write_stats(args.stats_log, game_number, result)
+        if recorder is not None:
+            recorder.write(
+                GameRecord(
+                    args.game.lower(),
+                    result.x_player,
+                    result.o_player,
+                    result.winner,
+                    result.moves,
+                )
+            )
+    if recorder is not None:
+        recorder.close()
+    print(format_report(results, time.time() - start_time))
+
+
+if __name__ == "__main__":
+    main()
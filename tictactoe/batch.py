@@ -0,0 +1,135 @@
+"""Play huge numbers of random and peek-ahead games at once with NumPy.
+
+Boards are rows of one array, with 0 for an open square, 1 for X and 2 for O.
+Every live game is on the same ply, so each step picks a move for all of them
+together, checks the mover's lines against the victory path matrix and
+retires the finished games. The policies match RandomAI and PeekAheadAI:
+take a winning square if there is one, otherwise block the opponent's
+winning square, otherwise pick an open square at random.
+
+NumPy is only needed for this module:
+
+    python -m tictactoe.batch --game supergame --games 1000000 --o peek_ahead
+"""
+import argparse
+import time
+from typing import Dict, Optional, Tuple, Type
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    raise ImportError("tictactoe.batch needs NumPy: pip install numpy") from None
+
+from tictactoe.games import BaseGame, game_type_by_name
+
+POLICIES = ("random", "peek_ahead")
+OPEN, X, O = 0, 1, 2
+
+
+class BatchSimulator:
+    def __init__(self, game_type: Type[BaseGame], seed: Optional[int] = None):
+        self.game_type = game_type
+        self.squares = game_type.SIZE ** 2
+        # One row per victory path, with a 1 for each square on it
+        self.paths = np.array(
+            [
+                [mask >> square & 1 for square in range(self.squares)]
+                for mask in game_type.VICTORY_MASKS
+            ],
+            dtype=np.int32,
+        )
+        self.path_lengths = self.paths.sum(axis=1)
+        self.rng = np.random.default_rng(seed)
+
+    def path_counts(self, boards: "np.ndarray", mark: int) -> "np.ndarray":
+        """How many of each path's squares hold mark, for every board."""
+        return (boards == mark).astype(np.int32) @ self.paths.T
+
+    def choose_moves(
+        self, boards: "np.ndarray", mark: int, policy: str
+    ) -> "np.ndarray":
+        priority = self.rng.random(boards.shape)
+        if policy == "peek_ahead":
+            own = self.path_counts(boards, mark)
+            theirs = self.path_counts(boards, X + O - mark)
+            needed = self.path_lengths - 1
+            winning_paths = (own == needed) & (theirs == 0)
+            losing_paths = (theirs == needed) & (own == 0)
+            priority += 2 * (winning_paths.astype(np.int32) @ self.paths > 0)
+            priority += losing_paths.astype(np.int32) @ self.paths > 0
+        elif policy != "random":
+            raise ValueError(f"Unknown policy {policy!r}, expected one of {POLICIES}")
+        priority[boards != OPEN] = -1.0
+        return priority.argmax(axis=1)
+
+    def play(
+        self, games: int, x_policy: str = "random", o_policy: str = "random"
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Play games to the end, returning each winner (0 for a draw) and length."""
+        boards = np.zeros((games, self.squares), dtype=np.int8)
+        winners = np.zeros(games, dtype=np.int8)
+        lengths = np.full(games, self.squares, dtype=np.int16)
+        live = np.arange(games)
+        for ply in range(self.squares):
+            if live.size == 0:
+                break
+            mark = X if ply % 2 == 0 else O
+            live_boards = boards[live]
+            moves = self.choose_moves(
+                live_boards, mark, x_policy if mark == X else o_policy
+            )
+            live_boards[np.arange(live.size), moves] = mark
+            boards[live] = live_boards
+            won = (self.path_counts(live_boards, mark) == self.path_lengths).any(axis=1)
+            winners[live[won]] = mark
+            lengths[live[won]] = ply + 1
+            live = live[~won]
+        return winners, lengths
+
+
+def simulate(
+    game_type: Type[BaseGame],
+    games: int,
+    x_policy: str = "random",
+    o_policy: str = "random",
+    batch_size: int = 100_000,
+    seed: Optional[int] = None,
+) -> Dict[str, int]:
+    """Count X wins, O wins and draws over games, a batch at a time."""
+    simulator = BatchSimulator(game_type, seed)
+    outcomes = {"X": 0, "O": 0, "draw": 0}
+    for start in range(0, games, batch_size):
+        winners, _ = simulator.play(min(batch_size, games - start), x_policy, o_policy)
+        outcomes["X"] += int((winners == X).sum())
+        outcomes["O"] += int((winners == O).sum())
+        outcomes["draw"] += int((winners == OPEN).sum())
+    return outcomes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate games in bulk.")
+    parser.add_argument("--game", default="supergame", help="game or supergame")
+    parser.add_argument("--games", type=int, default=1_000_000)
+    parser.add_argument("--x", default="random", choices=POLICIES)
+    parser.add_argument("--o", default="random", choices=POLICIES)
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    start_time = time.time()
+    outcomes = simulate(
+        game_type_by_name(args.game),
+        args.games,
+        args.x,
+        args.o,
+        args.batch_size,
+        args.seed,
+    )
+    elapsed = time.time() - start_time
+    print(f"{args.games} games in {elapsed:.1f}s ({args.games / elapsed:.0f}/sec)")
+    for outcome, count in outcomes.items():
+        print(f"{outcome:>5}: {count:>10} ({count / args.games:.2%})")
+
+
+if __name__ == "__main__":
+    main()
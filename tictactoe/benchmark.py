@@ -0,0 +1,173 @@
+"""Time the game primitives and FlawlessAI's search on a fixed set of positions.
+
+Every benchmark runs over the same corpus of Supergame positions, reached by
+seeded random play, and keeps the best of a few repeats. Save a baseline
+before changing the engine and compare against it afterwards:
+
+    python -m tictactoe.benchmark --save before.json
+    python -m tictactoe.benchmark --compare before.json
+
+A comparison exits with status 1 when any benchmark has slowed down by more
+than the threshold.
+"""
+import argparse
+import json
+from pathlib import Path
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from tictactoe.constants import Mark
+from tictactoe.games import Supergame
+from tictactoe.players import FlawlessAI, silent_listener, silent_speaker
+
+Results = Dict[str, Dict[str, float]]
+
+
+def supergame_corpus(positions: int = 24, seed: int = 0) -> List[Supergame]:
+    """Unfinished Supergame positions with between 3 and 8 marks on the board."""
+    rng = random.Random(seed)
+    corpus: List[Supergame] = []
+    while len(corpus) < positions:
+        game = Supergame()
+        for _ in range(rng.randint(3, 8)):
+            game.mark_board(*rng.choice(sorted(game.open_squares())))
+        if game.winner() is Mark.NOBODY:
+            corpus.append(game)
+    return corpus
+
+
+def time_best(
+    run: Callable[[], int], repeat: int, min_seconds: float = 0.2
+) -> Tuple[float, int]:
+    """Fastest rate over repeat rounds, each running for at least min_seconds.
+
+    Returns the round's time and the operations done in it.
+    """
+    best = (float("inf"), 0)
+    for _ in range(repeat):
+        seconds = 0.0
+        operations = 0
+        while operations == 0 or seconds < min_seconds:
+            start_time = time.perf_counter()
+            operations += run()
+            seconds += time.perf_counter() - start_time
+        if operations / seconds > best[1] / best[0]:
+            best = (seconds, operations)
+    return best
+
+
+def primitive(
+    corpus: List[Supergame], method: Callable[[Supergame], object], calls: int
+) -> Callable[[], int]:
+    def run() -> int:
+        for game in corpus:
+            for _ in range(calls):
+                method(game)
+        return len(corpus) * calls
+
+    return run
+
+
+def search(corpus: List[Supergame], depth: int) -> Callable[[], int]:
+    """Score every move of every position with a fresh agent, counting nodes."""
+
+    def run() -> int:
+        agent = FlawlessAI(silent_speaker, silent_listener)
+        for game in corpus:
+            agent.transposition_table.clear()
+            agent.reset_move_ordering()
+            for move in sorted(game.open_squares()):
+                agent.score_move(game, move, depth)
+        return agent.nodes
+
+    return run
+
+
+def run_benchmarks(
+    corpus: List[Supergame],
+    depths: List[int],
+    repeat: int = 3,
+    calls: int = 20,
+    min_seconds: float = 0.2,
+) -> Results:
+    agent = FlawlessAI(silent_speaker, silent_listener)
+    benchmarks = {
+        "get_squares_by_mark": primitive(
+            corpus, Supergame.get_squares_by_mark, calls
+        ),
+        "winner": primitive(corpus, Supergame.winner, calls),
+        "open_squares": primitive(corpus, Supergame.open_squares, calls),
+        "score_game_state": primitive(corpus, agent.score_game_state, calls),
+    }
+    for depth in depths:
+        benchmarks[f"score_move_depth_{depth}"] = search(corpus, depth)
+
+    results = {}
+    for name, run in benchmarks.items():
+        seconds, operations = time_best(run, repeat, min_seconds)
+        results[name] = {
+            "seconds": seconds,
+            "operations": operations,
+            "rate": operations / seconds,
+        }
+    return results
+
+
+def compare(
+    results: Results, baseline: Results, threshold: float
+) -> List[Tuple[str, float, bool]]:
+    """Each shared benchmark's rate relative to the baseline, and if it regressed."""
+    comparisons = []
+    for name, result in results.items():
+        if name in baseline:
+            ratio = result["rate"] / baseline[name]["rate"]
+            comparisons.append((name, ratio, ratio < 1 - threshold))
+    return comparisons
+
+
+def format_results(results: Results) -> str:
+    lines = [f"{'benchmark':<22} {'seconds':>9} {'operations':>11} {'per sec':>12}"]
+    for name, result in results.items():
+        unit = "nodes" if name.startswith("score_move") else "calls"
+        lines.append(
+            f"{name:<22} {result['seconds']:>9.4f} {result['operations']:>11.0f} "
+            f"{result['rate']:>12,.0f} {unit}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the game engine.")
+    parser.add_argument("--positions", type=int, default=24)
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", type=Path, help="write the results as a baseline")
+    parser.add_argument("--compare", type=Path, help="baseline to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="fractional slowdown that counts as a regression",
+    )
+    args = parser.parse_args()
+
+    corpus = supergame_corpus(args.positions)
+    results = run_benchmarks(corpus, args.depths, args.repeat)
+    print(format_results(results))
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressed = False
+        print(f"\n{'benchmark':<22} {'vs baseline':>12}")
+        for name, ratio, regression in compare(results, baseline, args.threshold):
+            print(f"{name:<22} {ratio:>11.2f}x{'  REGRESSION' if regression else ''}")
+            regressed = regressed or regression
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Opening books: the best reply to every early position, searched offline.
+
+A book file is a 12 byte header followed by fixed-size entries sorted by
+position key, so a lookup is a binary search over a memory-mapped file.
+Positions are stored once per symmetry class (see tictactoe.games.symmetry)
+with the reply given in the canonical orientation.
+
+Build one with:
+
+    python -m tictactoe.book supergame --plies 4 --depth 8
+"""
+import mmap
+from pathlib import Path
+import struct
+import time
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Type
+
+from tictactoe.constants import Address, Mark
+from tictactoe.games import BaseGame, canonical_key, game_type_by_name
+from tictactoe.games.symmetry import CanonicalKey
+
+if TYPE_CHECKING:
+    from tictactoe.players.flawless import FlawlessAI
+    from tictactoe.players.scores import MoveScore
+
+MAGIC = b"TTTB"
+VERSION = 1
+HEADER = struct.Struct("<4sBBxxI")  # magic, version, board size, entry count
+ENTRY = struct.Struct("<QfBB")  # position key, score, reply square, depth
+BOOK_DIRECTORY = Path(__file__).parent / "data"
+
+
+def pack_key(key: CanonicalKey) -> int:
+    x_bits, o_bits = key
+    return x_bits | o_bits << 32
+
+
+def book_path(game_type: Type[BaseGame]) -> Path:
+    return BOOK_DIRECTORY / f"{game_type.__name__.lower()}.book"
+
+
+class OpeningBook:
+    def __init__(self, path: Path):
+        with open(path, "rb") as book_file:
+            self.data = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, self.entry_count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} opening book")
+
+    def lookup(self, key: CanonicalKey) -> Optional[Tuple[Address, float, int]]:
+        """Find the reply, score and search depth stored for a canonical key."""
+        packed_key = pack_key(key)
+        low, high = 0, self.entry_count
+        while low < high:
+            middle = (low + high) // 2
+            offset = HEADER.size + middle * ENTRY.size
+            entry_key, score, square, depth = ENTRY.unpack_from(self.data, offset)
+            if entry_key < packed_key:
+                low = middle + 1
+            elif entry_key > packed_key:
+                high = middle
+            else:
+                return divmod(square, self.size), score, depth
+        return None
+
+    def best_move(self, game: BaseGame) -> Optional[Address]:
+        if game.SIZE != self.size:
+            return None
+        key, symmetry = canonical_key(game)
+        found = self.lookup(key)
+        if found is None:
+            return None
+        return symmetry.inverse.apply(found[0], game.SIZE)
+
+    def close(self) -> None:
+        self.data.close()
+
+
+_loaded_books: Dict[Path, Optional[OpeningBook]] = {}
+
+
+def load_book(game_type: Type[BaseGame]) -> Optional[OpeningBook]:
+    """Memory-map the game type's book once, or return None if there is none."""
+    path = book_path(game_type)
+    if path not in _loaded_books:
+        _loaded_books[path] = OpeningBook(path) if path.exists() else None
+    return _loaded_books[path]
+
+
+def opening_positions(game_type: Type[BaseGame], plies: int) -> Iterator[BaseGame]:
+    """Every unfinished position in the first plies moves, one per symmetry class."""
+    seen = set()
+    frontier = [game_type()]
+    for _ in range(plies):
+        next_frontier = []
+        for game in frontier:
+            key, symmetry = canonical_key(game)
+            if key in seen:
+                continue
+            seen.add(key)
+            canonical = game_type(symmetry.apply_to_board(game.board))
+            yield canonical
+            for move in canonical.open_squares():
+                child = canonical.copy()
+                child.mark_board(*move)
+                if child.winner() is Mark.NOBODY and child.open_squares():
+                    next_frontier.append(child)
+        frontier = next_frontier
+
+
+def build_book(
+    agent: "FlawlessAI", game_type: Type[BaseGame], plies: int, depth: int
+) -> List[Tuple[int, "MoveScore", Address, int]]:
+    entries = []
+    for game in opening_positions(game_type, plies):
+        move, score = agent.search_to_depth(game, depth)
+        key = pack_key((game.x_bits, game.o_bits))
+        entries.append((key, score, move, depth))
+    return sorted(entries)
+
+
+def write_book(
+    path: Path, size: int, entries: List[Tuple[int, "MoveScore", Address, int]]
+) -> None:
+    if size * size > 32:
+        raise ValueError("Opening books only hold boards of up to 32 squares")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as book_file:
+        book_file.write(HEADER.pack(MAGIC, VERSION, size, len(entries)))
+        for key, score, (row, col), depth in entries:
+            book_file.write(ENTRY.pack(key, score.score, row * size + col, depth))
+
+
+def main() -> None:
+    import argparse
+
+    from tictactoe.players import FlawlessAI, silent_listener, silent_speaker
+
+    parser = argparse.ArgumentParser(description="Build an opening book.")
+    parser.add_argument("game", help="game or supergame")
+    parser.add_argument("--plies", type=int, default=4, help="positions to cover")
+    parser.add_argument("--depth", type=int, default=8, help="search depth")
+    parser.add_argument("--output", type=Path, help="defaults to tictactoe/data")
+    args = parser.parse_args()
+
+    game_type = game_type_by_name(args.game)
+    agent = FlawlessAI(silent_speaker, silent_listener, table_size=2_000_000)
+    start_time = time.time()
+    entries = build_book(agent, game_type, args.plies, args.depth)
+    path = args.output or book_path(game_type)
+    write_book(path, game_type.SIZE, entries)
+    print(
+        f"Wrote {len(entries)} positions to {path} "
+        f"in {time.time() - start_time:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Best moves and scores for many positions at once.
+
+Positions are read one per line: the squares row by row as X, O or a dot,
+optionally followed by an id that is copied to the result. For example:
+
+    XO..XO.......... puzzle-17
+
+Each position is searched by FlawlessAI to a fixed depth, a node budget or
+both, with no time limit, so answers do not depend on how busy the machine
+is. The move and score reported always come from the depth reported, the
+last one searched to completion. moves_to_outcome is given for scores of 1
+and -1, proven wins and losses, and is null for any other score. Worker
+processes each keep one agent, so its transposition table stays warm from
+one position to the next. Only a few positions per worker are read ahead of
+the results, and results are written as JSON lines in input order as soon
+as they are ready:
+
+    python -m tictactoe.bulk positions.txt --depth 6 --workers 8 > results.jsonl
+"""
+import argparse
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import json
+import multiprocessing
+import sys
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+from tictactoe.constants import Mark
+from tictactoe.games import game_type_by_name, parse_cells
+from tictactoe.players import FlawlessAI, silent_listener, silent_speaker
+
+# Positions read ahead per worker, so reading never runs far ahead of searching
+READ_AHEAD = 4
+
+_worker: Dict[str, FlawlessAI] = {}
+
+
+def evaluate_position(
+    agent: FlawlessAI,
+    game_name: str,
+    line: str,
+    max_depth: Optional[int],
+    node_budget: Optional[int],
+) -> Dict[str, Any]:
+    cells, _, position_id = line.strip().partition(" ")
+    result: Dict[str, Any] = {"position": cells}
+    if position_id.strip():
+        result["id"] = position_id.strip()
+    try:
+        game_type = game_type_by_name(game_name)
+        game = game_type(parse_cells(game_type, cells))
+    except ValueError as error:
+        result["error"] = str(error)
+        return result
+    if not 0 <= game.mark_counts[Mark.X] - game.mark_counts[Mark.O] <= 1:
+        result["error"] = "X must have as many marks as O or one more"
+        return result
+    if game.winner() is not Mark.NOBODY or not game.open_squares():
+        result["error"] = "the game is over"
+        return result
+    start_nodes = agent.nodes
+    # Only whole depths are reported, so the score matches the depth given
+    move, score, depth = agent.search(
+        game, None, max_depth, node_budget, trust_partial_depth=False
+    )
+    result.update(
+        move=list(move),
+        score=float(score.score),
+        # Otherwise the score is a heuristic, and its depth is only the horizon
+        moves_to_outcome=score.depth if abs(score.score) == 1 else None,
+        depth=depth,
+        nodes=agent.nodes - start_nodes,
+    )
+    return result
+
+
+def _start_worker() -> None:
+    _worker["agent"] = FlawlessAI(silent_speaker, silent_listener)
+
+
+def _evaluate_in_worker(
+    task: Tuple[str, str, Optional[int], Optional[int]]
+) -> Dict[str, Any]:
+    return evaluate_position(_worker["agent"], *task)
+
+
+def evaluate_lines(
+    lines: Iterable[str],
+    game_name: str = "supergame",
+    max_depth: Optional[int] = None,
+    node_budget: Optional[int] = None,
+    workers: int = 1,
+) -> Iterator[Dict[str, Any]]:
+    """Evaluate each non-blank line, yielding the results in input order."""
+    if max_depth is None and node_budget is None:
+        raise ValueError("A depth or a node budget is needed")
+    tasks = (
+        (game_name, line, max_depth, node_budget) for line in lines if line.strip()
+    )
+    if workers <= 1:
+        agent = FlawlessAI(silent_speaker, silent_listener)
+        for task in tasks:
+            yield evaluate_position(agent, *task)
+        return
+    with ProcessPoolExecutor(workers, initializer=_start_worker) as executor:
+        pending: Deque[Future] = deque()
+        for task in tasks:
+            pending.append(executor.submit(_evaluate_in_worker, task))
+            if len(pending) >= workers * READ_AHEAD:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate positions in bulk.")
+    parser.add_argument(
+        "positions",
+        type=argparse.FileType("r"),
+        nargs="?",
+        default=sys.stdin,
+        help="one position per line, read from stdin if left out",
+    )
+    parser.add_argument("--game", default="supergame", help="game, supergame or NxN-k")
+    parser.add_argument("--depth", type=int, help="search depth")
+    parser.add_argument("--nodes", type=int, help="node budget per position")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--output", type=argparse.FileType("w"), default=sys.stdout)
+    args = parser.parse_args()
+
+    if args.depth is None and args.nodes is None:
+        parser.error("give a --depth, a --nodes budget or both")
+    for result in evaluate_lines(
+        args.positions, args.game, args.depth, args.nodes, args.workers
+    ):
+        args.output.write(json.dumps(result) + "\n")
+        args.output.flush()
+
+
+if __name__ == "__main__":
+    main()
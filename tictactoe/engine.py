@@ -0,0 +1,205 @@
+"""A long-running FlawlessAI engine driven by lines on stdin.
+
+Programs that need many moves can keep one engine process open instead of
+starting a game for each, and its transposition tables stay warm from one
+request to the next. Only the game modules, FlawlessAI and the modules it
+searches with are imported, so the engine starts quickly.
+Commands, one per line:
+
+    isready                         answered with readyok
+    position <game> [board <cells>] [moves <row,col> ...]
+                                    cells lists each square row by row as
+                                    X, O or . (for example X...O....)
+    time <seconds>                  the time budget for later searches
+    go [depth <n>] [nodes <n>] [time <seconds>] [infinite]
+    stop                            end the search early
+    quit                            once any search has answered
+
+A search runs in the background, so stop can end it. A position or go
+that comes in during a search waits for it to finish, except that an
+infinite search is stopped first. Each search is answered with an info
+line and then the best move:
+
+    info depth 6 score 0.25 nodes 51234 nps 88123 time 581 hits 10231 pv 1,1 2,2
+    bestmove 1,1
+
+Positions answered from a tablebase, opening book or opening rule skip the
+search and give an info line with only the move. Bad commands are answered
+with an error line. Run with:
+
+    python -m tictactoe.engine
+"""
+import math
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, TextIO, Type
+
+from tictactoe.constants import Mark, SquareFilled
+from tictactoe.games import BaseGame, Game, game_type_by_name, parse_cells
+from tictactoe.players.base import silent_listener, silent_speaker
+from tictactoe.players.flawless import FlawlessAI
+
+
+class Engine:
+    def __init__(self, output: TextIO = sys.stdout):
+        self.output = output
+        self.output_lock = threading.Lock()
+        # One agent per game type, each keeping its own tables warm
+        self.agents: Dict[Type[BaseGame], FlawlessAI] = {}
+        self.game: BaseGame = Game()
+        self.time_budget = float(FlawlessAI.TIME_CUTOFF)
+        self.search_thread: Optional[threading.Thread] = None
+        self.searching_agent: Optional[FlawlessAI] = None
+        self.search_is_infinite = False
+
+    def send(self, line: str) -> None:
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def handle(self, line: str) -> bool:
+        """Carry out one command, returning False once told to quit."""
+        words = line.split()
+        if not words:
+            return True
+        command, arguments = words[0], words[1:]
+        try:
+            if command == "quit":
+                self.finish()
+                return False
+            elif command == "isready":
+                self.send("readyok")
+            elif command == "position":
+                self.finish()
+                self.set_position(arguments)
+            elif command == "time":
+                self.time_budget = float(arguments[0])
+            elif command == "go":
+                self.finish()
+                self.go(arguments)
+            elif command == "stop":
+                self.stop()
+            else:
+                self.send(f"error unknown command {command}")
+        except SquareFilled:
+            self.send(f"error {command}: a square is played twice")
+        except (IndexError, ValueError) as error:
+            self.send(f"error {command}: {error or 'bad arguments'}")
+        return True
+
+    def set_position(self, arguments: List[str]) -> None:
+        game_type = game_type_by_name(arguments[0])
+        board = None
+        moves: List[str] = []
+        rest = arguments[1:]
+        if rest[:1] == ["board"]:
+            board = parse_cells(game_type, rest[1])
+            rest = rest[2:]
+        if rest[:1] == ["moves"]:
+            moves = rest[1:]
+        elif rest:
+            raise ValueError(f"unexpected {rest[0]!r}")
+        game = game_type(board) if board is not None else game_type()
+        for move in moves:
+            row, col = (int(index) for index in move.split(","))
+            if not (0 <= row < game.SIZE and 0 <= col < game.SIZE):
+                raise ValueError(f"{move} is off the board")
+            game.mark_board(row, col)
+        self.game = game
+
+    def agent(self, game_type: Type[BaseGame]) -> FlawlessAI:
+        if game_type not in self.agents:
+            self.agents[game_type] = FlawlessAI(silent_speaker, silent_listener)
+        return self.agents[game_type]
+
+    def go(self, arguments: List[str]) -> None:
+        if self.game.winner() is not Mark.NOBODY or not self.game.open_squares():
+            raise ValueError("the game is over")
+        budget: Optional[float] = self.time_budget
+        max_depth = node_budget = None
+        options = iter(arguments)
+        for option in options:
+            if option == "depth":
+                max_depth, budget = int(next(options, "")), None
+            elif option == "nodes":
+                node_budget, budget = int(next(options, "")), None
+            elif option == "time":
+                budget = float(next(options, ""))
+            elif option == "infinite":
+                budget = None
+            else:
+                raise ValueError(f"unknown option {option}")
+        # Searches without a time limit still need a deadline for stop to work
+        deadline = math.inf if budget is None else time.time() + budget
+        self.search_is_infinite = (
+            budget is None and max_depth is None and node_budget is None
+        )
+        self.searching_agent = self.agent(type(self.game))
+        self.search_thread = threading.Thread(
+            target=self.search,
+            args=(
+                self.searching_agent,
+                self.game.copy(),
+                deadline,
+                max_depth,
+                node_budget,
+            ),
+            daemon=True,
+        )
+        self.search_thread.start()
+
+    def search(
+        self,
+        agent: FlawlessAI,
+        game: BaseGame,
+        deadline: float,
+        max_depth: Optional[int],
+        node_budget: Optional[int],
+    ) -> None:
+        move = agent.prepared_move(game)
+        if move is not None:
+            self.send(f"info pv {move[0]},{move[1]}")
+        else:
+            move, _, _ = agent.search(game, deadline, max_depth, node_budget)
+            stats = agent.last_stats
+            if stats is not None:
+                line = " ".join(
+                    f"{row},{col}" for row, col in stats.principal_variation
+                )
+                self.send(
+                    f"info depth {stats.depth} score {stats.score:.4f} "
+                    f"nodes {stats.nodes} nps {stats.nodes_per_second:.0f} "
+                    f"time {stats.seconds * 1000:.0f} hits {stats.table_hits} "
+                    f"pv {line}"
+                )
+        self.send(f"bestmove {move[0]},{move[1]}")
+
+    def finish(self) -> None:
+        """Wait for a running search to end, stopping it if it never would."""
+        if self.search_is_infinite:
+            self.stop()
+        elif self.search_thread is not None:
+            self.search_thread.join()
+            self.search_thread = self.searching_agent = None
+
+    def stop(self) -> None:
+        """Cut any running search short and wait for its answer."""
+        if self.search_thread is None or self.searching_agent is None:
+            return
+        self.searching_agent.cancelled.set()
+        self.search_thread.join()
+        self.searching_agent.cancelled.clear()
+        self.search_thread = self.searching_agent = None
+
+
+def main() -> None:
+    engine = Engine()
+    for line in sys.stdin:
+        if not engine.handle(line):
+            break
+    engine.finish()
+
+
+if __name__ == "__main__":
+    main()
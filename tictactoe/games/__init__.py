@@ -2,3 +2,6 @@
 from .base import BaseGame
 from .game import Game
 from .supergame import Supergame
+from .k_in_a_row import KInARowGame, k_in_a_row
+from .symmetry import Symmetry, canonical_key
+from .registry import CELLS, GAME_TYPES, game_type_by_name, parse_cells
@@ -1,10 +1,21 @@
 from abc import ABC, abstractmethod
-from copy import deepcopy
-from itertools import product
-from typing import Dict, List, Optional, Set, Tuple
+import copy
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 
 from tictactoe.constants import Mark, SquareFilled, Address, VictoryPath
 
+from .bitboard import (
+    O_COUNT_UNIT,
+    addresses_in,
+    board_mask,
+    compile_victory_masks,
+    count_paths,
+    index_paths_by_square,
+    popcount,
+    square_bit,
+    zobrist_keys,
+)
+
 
 class BaseGame(ABC):
     @property
@@ -22,52 +33,206 @@ class BaseGame(ABC):
     def NAME(self) -> str:
         ...
 
-    @abstractmethod
-    def winner(self) -> Mark:
-        ...
+    # Compiled from SIZE and VICTORY_PATHS when a subclass is defined
+    VICTORY_MASKS: Tuple[int, ...]
+    PATH_LENGTHS: Tuple[int, ...]
+    PATHS_BY_SQUARE: Tuple[Tuple[int, ...], ...]
+    BOARD_MASK: int
+    ZOBRIST_KEYS: Tuple[Tuple[int, int], ...]
+
+    x_bits: int
+    o_bits: int
+    mark_counts: Dict[Mark, int]
+    # Marks on each victory path, packed as described in bitboard.O_COUNT_UNIT
+    path_counts: List[int]
+    position_hash: int
+    _open_squares: FrozenSet[Address]
+    _winner: Mark
+    _undo_stack: List[Tuple[int, int, int, int, int, FrozenSet[Address], Mark]]
 
-    board: List[List[Mark]]
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        size = cls.__dict__.get("SIZE")
+        paths = cls.__dict__.get("VICTORY_PATHS")
+        if isinstance(size, int) and isinstance(paths, tuple):
+            cls.VICTORY_MASKS = compile_victory_masks(size, paths)
+            cls.PATH_LENGTHS = tuple(popcount(mask) for mask in cls.VICTORY_MASKS)
+            cls.PATHS_BY_SQUARE = index_paths_by_square(size, cls.VICTORY_MASKS)
+            cls.BOARD_MASK = board_mask(size)
+            cls.ZOBRIST_KEYS = zobrist_keys(size, cls.VICTORY_MASKS)
 
     def __init__(self, starting_board: Optional[List[List[Mark]]] = None):
+        self.x_bits = 0
+        self.o_bits = 0
+        self._refresh()
+        self._undo_stack = []
         if starting_board:
             self.board = starting_board
-        else:
-            self.board = [
-                [Mark.NOBODY for _ in range(self.SIZE)] for _ in range(self.SIZE)
-            ]
+
+    @property
+    def board(self) -> List[List[Mark]]:
+        return [
+            [self.get_square_mark(row, col) for col in range(self.SIZE)]
+            for row in range(self.SIZE)
+        ]
+
+    @board.setter
+    def board(self, board: List[List[Mark]]) -> None:
+        self.x_bits = 0
+        self.o_bits = 0
+        for row, marks in enumerate(board):
+            for col, mark in enumerate(marks):
+                if mark is Mark.X:
+                    self.x_bits |= square_bit(self.SIZE, row, col)
+                elif mark is Mark.O:
+                    self.o_bits |= square_bit(self.SIZE, row, col)
+        self._refresh()
+        self._undo_stack = []
+
+    def _refresh(self) -> None:
+        """Rebuild the cached counts, open squares, winner and hash from the bits."""
+        self.mark_counts = {
+            Mark.X: popcount(self.x_bits),
+            Mark.O: popcount(self.o_bits),
+        }
+        self._open_squares = frozenset(
+            addresses_in(self.SIZE, self.BOARD_MASK & ~(self.x_bits | self.o_bits))
+        )
+        self.path_counts = count_paths(self.x_bits, self.o_bits, self.VICTORY_MASKS)
+        self._winner = self._scan_winner()
+        self.position_hash = 0
+        for square, (x_key, o_key) in enumerate(self.ZOBRIST_KEYS):
+            if self.x_bits >> square & 1:
+                self.position_hash ^= x_key
+            elif self.o_bits >> square & 1:
+                self.position_hash ^= o_key
 
     def get_board(self) -> List[List[Mark]]:
-        return deepcopy(self.board)
+        return self.board
+
+    def copy(self) -> "BaseGame":
+        game = copy.copy(self)
+        game.mark_counts = dict(self.mark_counts)
+        game.path_counts = list(self.path_counts)
+        game._undo_stack = list(self._undo_stack)
+        return game
 
     def get_square_mark(self, row: int, column: int) -> Mark:
-        return self.board[row][column]
+        bit = square_bit(self.SIZE, row, column)
+        if self.x_bits & bit:
+            return Mark.X
+        elif self.o_bits & bit:
+            return Mark.O
+        else:
+            return Mark.NOBODY
 
-    def open_squares(self) -> Set[Address]:
-        return self.get_squares_by_mark()[Mark.NOBODY]
+    def open_squares(self) -> FrozenSet[Address]:
+        return self._open_squares
 
     def next_mark(self) -> Mark:
-        squares_by_mark = self.get_squares_by_mark()
-        if len(squares_by_mark[Mark.NOBODY]) == 0:
+        if not self._open_squares:
             next_mark = Mark.NOBODY
-        elif len(squares_by_mark[Mark.X]) > len(squares_by_mark[Mark.O]):
+        elif self.mark_counts[Mark.X] > self.mark_counts[Mark.O]:
             next_mark = Mark.O
         else:
             next_mark = Mark.X
         return next_mark
 
+    def winner(self) -> Mark:
+        return self._winner
+
+    def _scan_winner(self) -> Mark:
+        for mark, bits in ((Mark.X, self.x_bits), (Mark.O, self.o_bits)):
+            for mask in self.VICTORY_MASKS:
+                if bits & mask == mask:
+                    return mark
+        return Mark.NOBODY
+
     def mark_board(
         self, row: int, col: int, mark: Optional[Mark] = None, force: bool = False
     ) -> None:
-        if self.board[row][col] is not Mark.NOBODY and not force:
-            raise SquareFilled(self.board[row][col])
+        current_mark = self.get_square_mark(row, col)
+        if current_mark is not Mark.NOBODY and not force:
+            raise SquareFilled(current_mark)
         if mark is None:
             mark = self.next_mark()
-        self.board[row][col] = mark
+        self._undo_stack.append(
+            (
+                self.x_bits,
+                self.o_bits,
+                self.mark_counts[Mark.X],
+                self.mark_counts[Mark.O],
+                self.position_hash,
+                self._open_squares,
+                self._winner,
+            )
+        )
+        square = row * self.SIZE + col
+        bit = 1 << square
+        if current_mark is not Mark.NOBODY:
+            self.x_bits &= ~bit
+            self.o_bits &= ~bit
+            self.mark_counts[current_mark] -= 1
+            self._shift_path_counts(square, -self._count_unit(current_mark))
+            self.position_hash ^= self.ZOBRIST_KEYS[square][current_mark is Mark.O]
+            self._open_squares = self._open_squares | {(row, col)}
+        if mark is Mark.NOBODY:
+            bits = 0
+        else:
+            if mark is Mark.X:
+                self.x_bits |= bit
+                bits = self.x_bits
+            else:
+                self.o_bits |= bit
+                bits = self.o_bits
+            self.mark_counts[mark] += 1
+            self._shift_path_counts(square, self._count_unit(mark))
+            self.position_hash ^= self.ZOBRIST_KEYS[square][mark is Mark.O]
+            self._open_squares = self._open_squares - {(row, col)}
+        if current_mark is not Mark.NOBODY:
+            # Overwriting can break an existing line, so look at the whole board
+            self._winner = self._scan_winner()
+        elif bits and self._winner is not Mark.X:
+            # Only lines through the new mark can have been completed
+            for path in self.PATHS_BY_SQUARE[square]:
+                mask = self.VICTORY_MASKS[path]
+                if bits & mask == mask:
+                    self._winner = mark
+                    break
+
+    def undo_mark(self) -> None:
+        """Take back the most recent call to mark_board."""
+        snapshot = self._undo_stack.pop()
+        x_bits, o_bits = snapshot[0], snapshot[1]
+        changed = (x_bits ^ self.x_bits) | (o_bits ^ self.o_bits)
+        if changed:
+            square = changed.bit_length() - 1
+            self._shift_path_counts(
+                square,
+                (x_bits >> square & 1) - (self.x_bits >> square & 1)
+                + ((o_bits >> square & 1) - (self.o_bits >> square & 1)) * O_COUNT_UNIT,
+            )
+        (
+            self.x_bits,
+            self.o_bits,
+            self.mark_counts[Mark.X],
+            self.mark_counts[Mark.O],
+            self.position_hash,
+            self._open_squares,
+            self._winner,
+        ) = snapshot
+
+    def _count_unit(self, mark: Mark) -> int:
+        return 1 if mark is Mark.X else O_COUNT_UNIT
+
+    def _shift_path_counts(self, square: int, change: int) -> None:
+        path_counts = self.path_counts
+        for path in self.PATHS_BY_SQUARE[square]:
+            path_counts[path] += change
 
     def get_squares_by_mark(self) -> Dict[Mark, Set[Address]]:
-        addresses = product(range(self.SIZE), range(self.SIZE))
-        squares_by_mark: Dict[Mark, Set[Address]] = {m: set() for m in Mark}
-        for address in addresses:
-            mark = self.get_square_mark(*address)
-            squares_by_mark[mark].add(address)
-        return squares_by_mark
+        return {
+            Mark.NOBODY: set(self._open_squares),
+            Mark.X: addresses_in(self.SIZE, self.x_bits),
+            Mark.O: addresses_in(self.SIZE, self.o_bits),
+        }
@@ -0,0 +1,71 @@
+from functools import lru_cache
+from random import Random
+from typing import Iterable, List, Set, Tuple
+
+from tictactoe.constants import Address, VictoryPath
+
+
+# Each victory path's marks are counted in a single int: the number of X marks
+# plus the number of O marks times O_COUNT_UNIT
+O_COUNT_UNIT = 1 << 8
+
+
+def square_bit(size: int, row: int, col: int) -> int:
+    return 1 << (row * size + col)
+
+
+def board_mask(size: int) -> int:
+    return (1 << size * size) - 1
+
+
+def path_mask(size: int, path: Iterable[Address]) -> int:
+    mask = 0
+    for row, col in path:
+        mask |= square_bit(size, row, col)
+    return mask
+
+
+def compile_victory_masks(size: int, paths: Tuple[VictoryPath, ...]) -> Tuple[int, ...]:
+    return tuple(path_mask(size, path) for path in paths)
+
+
+def popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+def count_paths(x_bits: int, o_bits: int, masks: Tuple[int, ...]) -> List[int]:
+    return [
+        popcount(x_bits & mask) + popcount(o_bits & mask) * O_COUNT_UNIT
+        for mask in masks
+    ]
+
+
+def addresses_in(size: int, bits: int) -> Set[Address]:
+    addresses = set()
+    while bits:
+        low_bit = bits & -bits
+        addresses.add(divmod(low_bit.bit_length() - 1, size))
+        bits ^= low_bit
+    return addresses
+
+
+def index_paths_by_square(
+    size: int, masks: Tuple[int, ...]
+) -> Tuple[Tuple[int, ...], ...]:
+    return tuple(
+        tuple(i for i, mask in enumerate(masks) if mask >> square & 1)
+        for square in range(size * size)
+    )
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size: int, masks: Tuple[int, ...]) -> Tuple[Tuple[int, int], ...]:
+    """Random 64-bit keys for an X and an O on each square, fixed per rule set.
+
+    Seeding with the victory masks as well as the size keeps positions from
+    different games on the same board from sharing transposition entries.
+    """
+    rng = Random(f"zobrist-{size}-{masks}")
+    return tuple(
+        (rng.getrandbits(64), rng.getrandbits(64)) for _ in range(size * size)
+    )
@@ -1,6 +1,6 @@
 from typing import Tuple
 
-from tictactoe.constants import Mark, VictoryPath
+from tictactoe.constants import VictoryPath
 
 from .base import BaseGame
 
@@ -21,16 +21,3 @@ class Game(BaseGame):
         {(0, 0), (1, 1), (2, 2)},
         {(2, 0), (1, 1), (0, 2)},
     )
-
-    def winner(self) -> Mark:
-        squares_by_mark = self.get_squares_by_mark()
-        winner = Mark.NOBODY
-        for mark in (Mark.X, Mark.O):
-            squares = squares_by_mark[mark]
-            for victory_path in self.VICTORY_PATHS:
-                if victory_path.issubset(squares):
-                    winner = mark
-                    break
-            if winner is not Mark.NOBODY:
-                break
-        return winner
@@ -0,0 +1,79 @@
+from typing import Any, Dict, Tuple, Type
+
+from tictactoe.constants import VictoryPath
+
+from .base import BaseGame
+from .paths import column_paths, corner_paths, diagonal_paths, row_paths, square_paths
+
+
+def k_in_a_row_paths(
+    size: int, k: int, square_wins: bool = False, corner_wins: bool = False
+) -> Tuple[VictoryPath, ...]:
+    paths = row_paths(size, k) + column_paths(size, k) + diagonal_paths(size, k)
+    if square_wins:
+        paths += square_paths(size)
+    if corner_wins:
+        paths += corner_paths(size)
+    return paths
+
+
+class KInARowGame(BaseGame):
+    """Tic-Tac-Toe on a larger board, won with k marks in a row.
+
+    Make a variant with k_in_a_row, which builds each game type once, so its
+    victory paths are only generated and compiled into masks once.
+    """
+
+    K: int
+    SQUARE_WINS: bool
+    CORNER_WINS: bool
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Variants are built at runtime, so pickle them by their rules
+        rules = (self.SIZE, self.K, self.SQUARE_WINS, self.CORNER_WINS)
+        return _new_game, rules, self.__dict__
+
+
+_variants: Dict[Tuple[int, int, bool, bool], Type[KInARowGame]] = {}
+
+
+def k_in_a_row(
+    size: int, k: int, square_wins: bool = False, corner_wins: bool = False
+) -> Type[KInARowGame]:
+    """The game type for a variant, the same class every time it is asked for."""
+    rules = (size, k, bool(square_wins), bool(corner_wins))
+    if rules not in _variants:
+        _variants[rules] = _make_variant(*rules)
+    return _variants[rules]
+
+
+def _make_variant(
+    size: int, k: int, square_wins: bool, corner_wins: bool
+) -> Type[KInARowGame]:
+    if not 2 <= k <= size:
+        raise ValueError(f"Cannot make {k} in a row on a {size}x{size} board")
+    name = f"{size}x{size} Tic-Tac-Toe, {k} in a row"
+    class_name = f"KInARow{size}x{size}k{k}"
+    if square_wins:
+        name += ", squares win"
+        class_name += "Squares"
+    if corner_wins:
+        name += ", corners win"
+        class_name += "Corners"
+    namespace = {
+        "__module__": __name__,
+        "NAME": name,
+        "SIZE": size,
+        "VICTORY_PATHS": k_in_a_row_paths(size, k, square_wins, corner_wins),
+        "K": k,
+        "SQUARE_WINS": square_wins,
+        "CORNER_WINS": corner_wins,
+    }
+    return type(class_name, (KInARowGame,), namespace)
+
+
+def _new_game(
+    size: int, k: int, square_wins: bool, corner_wins: bool
+) -> KInARowGame:
+    game_type = k_in_a_row(size, k, square_wins, corner_wins)
+    return game_type.__new__(game_type)
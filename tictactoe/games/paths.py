@@ -0,0 +1,40 @@
+from itertools import product
+from typing import Tuple
+
+from tictactoe.constants import VictoryPath
+
+
+def row_paths(size: int, k: int) -> Tuple[VictoryPath, ...]:
+    return tuple(
+        {(r, c + i) for i in range(k)}
+        for r in range(size)
+        for c in range(size - k + 1)
+    )
+
+
+def column_paths(size: int, k: int) -> Tuple[VictoryPath, ...]:
+    return tuple(
+        {(r + i, c) for i in range(k)}
+        for c in range(size)
+        for r in range(size - k + 1)
+    )
+
+
+def diagonal_paths(size: int, k: int) -> Tuple[VictoryPath, ...]:
+    """Runs of k up and to the right, then runs of k down and to the right."""
+    starts = list(product(range(size - k + 1), range(size - k + 1)))
+    return tuple(
+        {(r + i, c + k - 1 - i) for i in range(k)} for r, c in starts
+    ) + tuple({(r + i, c + i) for i in range(k)} for r, c in starts)
+
+
+def square_paths(size: int) -> Tuple[VictoryPath, ...]:
+    """Every two by two block of squares."""
+    return tuple(
+        {(x, y), (x + 1, y), (x, y + 1), (x + 1, y + 1)}
+        for x, y in product(range(size - 1), range(size - 1))
+    )
+
+
+def corner_paths(size: int) -> Tuple[VictoryPath, ...]:
+    return ({(0, 0), (0, size - 1), (size - 1, 0), (size - 1, size - 1)},)
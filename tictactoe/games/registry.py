@@ -0,0 +1,47 @@
+import re
+from typing import Dict, List, Type
+
+from tictactoe.constants import Mark
+
+from .base import BaseGame
+from .game import Game
+from .k_in_a_row import k_in_a_row
+from .supergame import Supergame
+
+GAME_TYPES: Dict[str, Type[BaseGame]] = {
+    "game": Game,
+    "supergame": Supergame,
+}
+
+# For example 7x7-5 or 6x6-4-squares-corners
+VARIANT_PATTERN = re.compile(r"(\d+)x\1-(\d+)((?:-squares|-corners)*)")
+
+CELLS = {"X": Mark.X, "O": Mark.O, ".": Mark.NOBODY}
+
+
+def game_type_by_name(name: str) -> Type[BaseGame]:
+    name = name.lower()
+    if name in GAME_TYPES:
+        return GAME_TYPES[name]
+    variant = VARIANT_PATTERN.fullmatch(name)
+    if variant is None:
+        raise ValueError(
+            f"Unknown game {name!r}, expected one of {', '.join(GAME_TYPES)} "
+            "or a variant like 7x7-5 or 6x6-4-squares-corners"
+        )
+    size, k, options = variant.groups()
+    return k_in_a_row(int(size), int(k), "-squares" in options, "-corners" in options)
+
+
+def parse_cells(game_type: Type[BaseGame], cells: str) -> List[List[Mark]]:
+    """A board from its squares row by row, each one X, O or a dot."""
+    if len(cells) != game_type.SIZE ** 2:
+        raise ValueError(f"expected {game_type.SIZE ** 2} cells")
+    try:
+        marks = [CELLS[cell] for cell in cells.upper()]
+    except KeyError as error:
+        raise ValueError(f"unknown cell {error.args[0]!r}")
+    return [
+        marks[row : row + game_type.SIZE]
+        for row in range(0, len(marks), game_type.SIZE)
+    ]
@@ -0,0 +1,127 @@
+from enum import Enum
+from functools import lru_cache
+from typing import List, Tuple, TypeVar
+
+from tictactoe.constants import Address
+
+from .base import BaseGame
+
+T = TypeVar("T")
+CanonicalKey = Tuple[int, int]
+
+
+class Symmetry(Enum):
+    """The eight ways to rotate and reflect a square board onto itself."""
+
+    IDENTITY = 0
+    ROTATE_90 = 1  # Clockwise
+    ROTATE_180 = 2
+    ROTATE_270 = 3
+    VFLIP = 4  # Top and bottom swap
+    HFLIP = 5  # Left and right swap
+    TRANSPOSE = 6  # Mirror across the main diagonal
+    ANTITRANSPOSE = 7  # Mirror across the other diagonal
+
+    def apply(self, address: Address, size: int) -> Address:
+        row, col = address
+        last = size - 1
+        if self is Symmetry.IDENTITY:
+            return (row, col)
+        elif self is Symmetry.ROTATE_90:
+            return (col, last - row)
+        elif self is Symmetry.ROTATE_180:
+            return (last - row, last - col)
+        elif self is Symmetry.ROTATE_270:
+            return (last - col, row)
+        elif self is Symmetry.VFLIP:
+            return (last - row, col)
+        elif self is Symmetry.HFLIP:
+            return (row, last - col)
+        elif self is Symmetry.TRANSPOSE:
+            return (col, row)
+        else:
+            return (last - col, last - row)
+
+    @property
+    def inverse(self) -> "Symmetry":
+        if self is Symmetry.ROTATE_90:
+            return Symmetry.ROTATE_270
+        elif self is Symmetry.ROTATE_270:
+            return Symmetry.ROTATE_90
+        else:
+            return self
+
+    def apply_to_board(self, board: List[List[T]]) -> List[List[T]]:
+        size = len(board)
+        new_board = [list(row) for row in board]
+        for row, marks in enumerate(board):
+            for col, mark in enumerate(marks):
+                new_row, new_col = self.apply((row, col), size)
+                new_board[new_row][new_col] = mark
+        return new_board
+
+    def apply_to_bits(self, bits: int, size: int) -> int:
+        new_bits = 0
+        for chunk, table in enumerate(_bit_tables(self, size)):
+            new_bits |= table[bits >> 8 * chunk & 0xFF]
+        return new_bits
+
+
+@lru_cache(maxsize=None)
+def _bit_tables(symmetry: Symmetry, size: int) -> Tuple[Tuple[int, ...], ...]:
+    """For each byte of a bitboard, the transformed bits of all 256 values."""
+    targets = [
+        1 << (row * size + col)
+        for row, col in (
+            symmetry.apply(divmod(square, size), size) for square in range(size * size)
+        )
+    ]
+    tables = []
+    for chunk in range((size * size + 7) // 8):
+        table = []
+        for byte in range(256):
+            bits = 0
+            for offset in range(8):
+                square = 8 * chunk + offset
+                if byte >> offset & 1 and square < size * size:
+                    bits |= targets[square]
+            table.append(bits)
+        tables.append(tuple(table))
+    return tuple(tables)
+
+
+@lru_cache(maxsize=None)
+def _preserving_symmetries(
+    size: int, victory_masks: Tuple[int, ...]
+) -> Tuple[Symmetry, ...]:
+    paths = set(victory_masks)
+    return tuple(
+        symmetry
+        for symmetry in Symmetry
+        if {symmetry.apply_to_bits(mask, size) for mask in paths} == paths
+    )
+
+
+def game_symmetries(game: BaseGame) -> Tuple[Symmetry, ...]:
+    """The symmetries that map the game's victory paths onto themselves."""
+    return _preserving_symmetries(game.SIZE, game.VICTORY_MASKS)
+
+
+def canonical_key(game: BaseGame) -> Tuple[CanonicalKey, Symmetry]:
+    """Find the smallest (x_bits, o_bits) among the game's symmetric positions.
+
+    Returns the key along with the symmetry that maps the game onto it. Use
+    symmetry.apply to carry moves into the canonical position, and
+    symmetry.inverse.apply to carry them back.
+    """
+    best_key = (game.x_bits, game.o_bits)
+    best_symmetry = Symmetry.IDENTITY
+    for symmetry in game_symmetries(game):
+        key = (
+            symmetry.apply_to_bits(game.x_bits, game.SIZE),
+            symmetry.apply_to_bits(game.o_bits, game.SIZE),
+        )
+        if key < best_key:
+            best_key = key
+            best_symmetry = symmetry
+    return best_key, best_symmetry
@@ -0,0 +1,176 @@
+"""Load generator for tictactoe.server.
+
+Opens many connections at once and has each play whole games with random
+moves against a computer player on the server. Move latency is the time
+from sending a move to being asked for the next one, so it includes the
+server's reply. For example, against a running server:
+
+    python -m tictactoe.loadgen --sessions 5000 --concurrency 2000
+
+or with a server started in the same process:
+
+    python -m tictactoe.loadgen --serve --workers 4
+
+Thousands of concurrent connections may need a higher open file limit
+(ulimit -n) on both ends.
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import multiprocessing
+import random
+import time
+from typing import List, Optional
+
+from tictactoe.server import GameServer
+
+
+@dataclass
+class LoadReport:
+    games: int = 0
+    moves: int = 0
+    errors: int = 0
+    peak_sessions: int = 0
+    seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    def percentile(self, fraction: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self) -> str:
+        return "\n".join(
+            [
+                f"{self.games} games, {self.moves} moves, {self.errors} errors "
+                f"in {self.seconds:.1f}s ({self.games / self.seconds:.1f} games/sec)",
+                f"peak concurrent sessions: {self.peak_sessions}",
+                f"move latency p50 {self.percentile(0.5) * 1000:.1f}ms, "
+                f"p99 {self.percentile(0.99) * 1000:.1f}ms, "
+                f"max {self.percentile(1.0) * 1000:.1f}ms",
+            ]
+        )
+
+
+async def play_session(
+    host: str, port: int, game_name: str, opponent: str, report: LoadReport
+) -> None:
+    """Connect, play one game as X with random moves, and disconnect."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await reader.readline()  # HELLO
+        writer.write(f"NEW {game_name} human {opponent}\n".encode())
+        open_squares: List[List[int]] = []
+        sent_at: Optional[float] = None
+        while True:
+            words = (await reader.readline()).decode().split()
+            if not words:
+                raise ConnectionError("server closed the connection")
+            if words[0] == "GAME":
+                size = int(words[2])
+                open_squares = [
+                    [row, col] for row in range(size) for col in range(size)
+                ]
+            elif words[0] == "MOVED":
+                open_squares.remove([int(words[2]), int(words[3])])
+            elif words[0] in ("YOUR_MOVE", "END"):
+                if sent_at is not None:
+                    report.latencies.append(time.perf_counter() - sent_at)
+                    sent_at = None
+                if words[0] == "END":
+                    report.games += 1
+                    break
+                row, col = random.choice(open_squares)
+                sent_at = time.perf_counter()
+                writer.write(f"MOVE {row} {col}\n".encode())
+                report.moves += 1
+            elif words[0] == "ERROR":
+                raise ValueError(" ".join(words))
+        writer.write(b"QUIT\n")
+    finally:
+        writer.close()
+
+
+async def run_load(
+    host: str,
+    port: int,
+    sessions: int,
+    concurrency: int,
+    game_name: str = "game",
+    opponent: str = "random",
+) -> LoadReport:
+    report = LoadReport()
+    slots = asyncio.Semaphore(concurrency)
+    active = 0
+
+    async def session() -> None:
+        nonlocal active
+        async with slots:
+            active += 1
+            report.peak_sessions = max(report.peak_sessions, active)
+            try:
+                await play_session(host, port, game_name, opponent, report)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                # Refused, reset or timed out connections, or running out of files
+                report.errors += 1
+            finally:
+                active -= 1
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(sessions)))
+    report.seconds = time.perf_counter() - start_time
+    return report
+
+
+async def serve_and_load(args: argparse.Namespace) -> LoadReport:
+    game_server = GameServer(args.workers, args.time_cutoff)
+    server = await game_server.start(args.host, args.port)
+    try:
+        return await run_load(
+            args.host,
+            args.port,
+            args.sessions,
+            args.concurrency,
+            args.game,
+            args.opponent,
+        )
+    finally:
+        server.close()
+        await server.wait_closed()
+        game_server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Put load on a game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", type=int, default=1000, help="games to play")
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--game", default="game", help="game, supergame or a variant")
+    parser.add_argument("--opponent", default="random", help="server-side player")
+    parser.add_argument(
+        "--serve", action="store_true", help="start a server in this process"
+    )
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--time-cutoff", type=float)
+    args = parser.parse_args()
+
+    if args.serve:
+        report = asyncio.run(serve_and_load(args))
+    else:
+        report = asyncio.run(
+            run_load(
+                args.host,
+                args.port,
+                args.sessions,
+                args.concurrency,
+                args.game,
+                args.opponent,
+            )
+        )
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,48 @@
 # flake8: noqa
-from .base import Player
-from .human import Human
-from .random import RandomAI
-from .peek_ahead import PeekAheadAI
-from .flawless import FlawlessAI
+"""Players, each imported the first time it is asked for.
+
+Importing one player, as the engine does with FlawlessAI, leaves the others
+and their dependencies unloaded. For the same reason, asyncio,
+multiprocessing and the process pools are only imported where an event
+loop or worker processes are actually started, here and in the tablebase
+builder.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+from .base import Player, silent_listener, silent_speaker
+
+# The submodule each lazily imported name comes from
+_SUBMODULES = {
+    "Human": "human",
+    "RandomAI": "random",
+    "PeekAheadAI": "peek_ahead",
+    "FlawlessAI": "flawless",
+    "MonteCarloAI": "mcts",
+    "PLAYER_TYPES": "registry",
+    "player_type_by_name": "registry",
+    "computer_player_type_by_name": "registry",
+    "SearchStats": "stats",
+    "json_lines_writer": "stats",
+}
+
+if TYPE_CHECKING:
+    from .human import Human
+    from .random import RandomAI
+    from .peek_ahead import PeekAheadAI
+    from .flawless import FlawlessAI
+    from .mcts import MonteCarloAI
+    from .registry import (
+        PLAYER_TYPES,
+        computer_player_type_by_name,
+        player_type_by_name,
+    )
+    from .stats import SearchStats, json_lines_writer
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_SUBMODULES[name]}", __name__), name)
+    globals()[name] = value
+    return value
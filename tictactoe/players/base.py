@@ -1,8 +1,12 @@
+from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Callable, Tuple
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
 
 from tictactoe.games import BaseGame
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
 
 class Player(ABC):
     # speaker: Callable[[str], None]
@@ -16,6 +20,28 @@ class Player(ABC):
     def get_move(self, game: BaseGame) -> Tuple[int, int]:
         ...
 
+    async def get_move_async(
+        self, game: BaseGame, executor: Optional[Executor] = None
+    ) -> Tuple[int, int]:
+        """get_move for an event loop, run in executor so the loop keeps going.
+
+        Without an executor the loop's default thread pool is used.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.get_move, game)
+
+    def ponder(self, game: BaseGame) -> None:
+        """Think about game while the opponent chooses their move.
+
+        Called just after this player moves, and ended by the next get_move
+        or by stop_pondering. Players that cannot ponder do nothing.
+        """
+
+    def stop_pondering(self) -> None:
+        """Abandon any thinking started by ponder."""
+
     @abstractmethod
     def mood(self, game: BaseGame) -> str:
         ...
@@ -27,3 +53,12 @@ class Player(ABC):
 
     def __str__(self):
         return self.NAME
+
+
+def silent_speaker(message: str) -> None:
+    """A speaker for players that run without a screen."""
+
+
+def silent_listener() -> str:
+    """A listener for players that run without a keyboard."""
+    return ""
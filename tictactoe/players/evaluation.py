@@ -0,0 +1,94 @@
+"""FlawlessAI's heuristic, read from the game's incremental path counts.
+
+Each path's score depends only on how many X and O marks it holds, so the
+scores are looked up in a table indexed by BaseGame.path_counts rather than
+counted square by square. The squashing of the total into (-1, 1) is cached
+per total, and gives the same floats as FlawlessAI always has, except that
+totals big enough to round to 1 or -1 are kept just inside, since search
+takes those scores as won or lost games.
+"""
+from functools import lru_cache
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from tictactoe.constants import Address, Mark
+from tictactoe.games import BaseGame
+from tictactoe.games.bitboard import O_COUNT_UNIT
+
+
+def path_score(x_count: int, o_count: int) -> int:
+    """As a convention, O is negative and X is positive."""
+    if x_count and o_count:
+        return 0
+    return x_count ** 2 - o_count ** 2
+
+
+@lru_cache(maxsize=None)
+def path_score_table(length: int) -> Tuple[int, ...]:
+    """Path scores indexed by packed path counts, for paths up to length squares."""
+    table = [0] * (length * O_COUNT_UNIT + length + 1)
+    for x_count in range(length + 1):
+        for o_count in range(length + 1 - x_count):
+            table[x_count + o_count * O_COUNT_UNIT] = path_score(x_count, o_count)
+    return tuple(table)
+
+
+_squashed: Dict[int, float] = {}
+# The furthest from 0 a heuristic score can be
+SQUASH_LIMIT = 1 - 2 ** -40
+
+
+def squash(total: int) -> float:
+    value = _squashed.get(total)
+    if value is None:
+        try:
+            value = 2 / (1 + math.e ** (-total)) - 1
+        except OverflowError:
+            value = -1.0
+        value = min(max(value, -SQUASH_LIMIT), SQUASH_LIMIT)
+        _squashed[total] = value
+    return value
+
+
+def completed_path_score(game: BaseGame) -> int:
+    """1 or -1 for the first path in the game's order that one mark has filled."""
+    for count, length in zip(game.path_counts, game.PATH_LENGTHS):
+        if count == length:
+            return 1
+        if count == length * O_COUNT_UNIT:
+            return -1
+    return 0
+
+
+def evaluate(game: BaseGame) -> float:
+    """A score of 1 means an X victory and a score of -1 means an O victory."""
+    if game.winner() is not Mark.NOBODY:
+        return completed_path_score(game)
+    table = path_score_table(max(game.PATH_LENGTHS))
+    return squash(sum(map(table.__getitem__, game.path_counts)))
+
+
+def evaluate_children(
+    game: BaseGame, moves: Iterable[Address]
+) -> List[Optional[float]]:
+    """What evaluate would give after each move by the next mark, in one pass.
+
+    A move that completes a path gets None in place of its 1 or -1. The
+    game must not be won already.
+    """
+    table = path_score_table(max(game.PATH_LENGTHS))
+    path_counts = game.path_counts
+    unit = 1 if game.next_mark() is Mark.X else O_COUNT_UNIT
+    total = sum(map(table.__getitem__, path_counts))
+    scores: List[Optional[float]] = []
+    for row, col in moves:
+        child_total = total
+        for path in game.PATHS_BY_SQUARE[row * game.SIZE + col]:
+            count = path_counts[path]
+            if count + unit == game.PATH_LENGTHS[path] * unit:
+                scores.append(None)
+                break
+            child_total += table[count + unit] - table[count]
+        else:
+            scores.append(squash(child_total))
+    return scores
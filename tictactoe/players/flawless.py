@@ -1,49 +1,182 @@
 from __future__ import annotations
-from collections import Counter
-from copy import deepcopy
-from dataclasses import dataclass
 import math
 from random import choice
+import threading
 import time
-from typing import Any, Set, Tuple, cast
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple, cast
 
+from tictactoe.book import load_book
 from tictactoe.players.base import Player
+from tictactoe.players.evaluation import evaluate, evaluate_children, path_score
+from tictactoe.players.scores import (
+    HIGHEST_SCORE,
+    LOWEST_SCORE,
+    MoveScore,
+    SearchTimeout,
+)
+from tictactoe.players.stats import IterationStats, SearchStats
+from tictactoe.players.transposition import Bound, TableEntry, TranspositionTable
+from tictactoe.tablebase import load_tablebase
 from tictactoe.games import BaseGame, Game, Supergame
 from tictactoe.constants import Address, Mark
 
+if TYPE_CHECKING:
+    from tictactoe.players.parallel import ParallelRootSearch
+
 
 class FlawlessAI(Player):
     NAME = "The Flawless AI Agent"
     TIME_CUTOFF = 3
+    TABLE_SIZE = 200_000
+
+    def __init__(
+        self,
+        speaker: Callable[[str], None],
+        listener: Callable[[], str],
+        table_size: Optional[int] = None,
+        workers: int = 1,
+    ):
+        super().__init__(speaker, listener)
+        self.transposition_table = TranspositionTable(
+            self.TABLE_SIZE if table_size is None else table_size
+        )
+        self.reset_move_ordering()
+        self.deadline: Optional[float] = None
+        self.node_limit: Optional[int] = None  # Searches stop when nodes reaches it
+        self.nodes = 0
+        self.cutoffs = 0
+        # Set after every move; stats_callback, if any, is also handed the record
+        self.last_stats: Optional[SearchStats] = None
+        self.stats_callback: Optional[Callable[[SearchStats], None]] = None
+        # Pondering searches the expected reply in a thread until cancelled
+        self.ponder_thread: Optional[threading.Thread] = None
+        self.cancelled = threading.Event()
+        self.ponder_started = 0.0
+        self.ponder_position: Optional[Tuple[int, int]] = None
+        self.ponder_result: Optional[Tuple[Address, MoveScore, int]] = None
+        self.ponder_stats: Optional[SearchStats] = None
+        self.parallel_search: Optional[ParallelRootSearch] = None
+        if workers > 1:
+            from tictactoe.players import parallel
+
+            self.parallel_search = parallel.ParallelRootSearch(
+                type(self), workers, table_size
+            )
 
     def get_move(self, game: BaseGame) -> Tuple[int, int]:
-        if self.is_first_move(game):
-            if type(game) == Game:
-                move = self.first_move_of_game(cast(Game, game))
-            else:
-                move = self.first_move_of_supergame(cast(Supergame, game))
-        elif type(game) == Supergame and self.is_second_move(game):
-            move = self.second_move_of_supergame(cast(Supergame, game))
+        pondered_move = self.finish_pondering(game)
+        self.last_stats = None
+        prepared_move = self.prepared_move(game)
+        if prepared_move is not None:
+            move = prepared_move
+        elif pondered_move is not None:
+            move = pondered_move
+            self.last_stats = self.ponder_stats
         else:
-            start_time = time.time()
-            depth = 0
-            while time.time() - start_time < self.TIME_CUTOFF:
-                best_score = MoveScore(-2.0, 0)
-                move = (game.SIZE, game.SIZE)
-                for option in game.open_squares():
-                    opt_score = self.score_move(game, option, depth)
-                    if opt_score > best_score:
-                        best_score = opt_score
-                        move = option
-                    if best_score.score == 1.0:
-                        break
-                depth += 1
-                if best_score.score == 1.0:
-                    break
+            move, _, _ = self.search(game, deadline=time.time() + self.TIME_CUTOFF)
+        if self.last_stats is None:
+            self.last_stats = SearchStats(move)
+        if self.stats_callback is not None:
+            self.stats_callback(self.last_stats)
         self.speaker(f"{self} claims {move}. Press any key.\n")
         self.listener()
         return move
 
+    def prepared_move(self, game: BaseGame) -> Optional[Address]:
+        """A move from the tablebase, the book or the opening rules, if any."""
+        known_move = self.tablebase_move(game) or self.book_move(game)
+        if known_move is not None:
+            return known_move
+        if type(game) in (Game, Supergame) and self.is_first_move(game):
+            if type(game) == Game:
+                return self.first_move_of_game(cast(Game, game))
+            return self.first_move_of_supergame(cast(Supergame, game))
+        if type(game) == Supergame and self.is_second_move(game):
+            return self.second_move_of_supergame(cast(Supergame, game))
+        return None
+
+    def ponder(self, game: BaseGame) -> None:
+        """Search the position after the opponent's expected reply in the background.
+
+        The expected reply is the second move of the last principal
+        variation. When the opponent plays it, get_move keeps the pondering
+        search going until TIME_CUTOFF seconds after pondering began, so the
+        time the opponent spent thinking counts towards this move. Searches
+        split over worker processes do not watch for cancellation, so they
+        never ponder.
+        """
+        self.stop_pondering()
+        if self.parallel_search is not None or game.winner() is not Mark.NOBODY:
+            return
+        if not game.open_squares():
+            return
+        expected_reply = None
+        line = self.last_stats.principal_variation if self.last_stats else []
+        if (
+            len(line) > 1
+            and game.get_square_mark(*line[0]) is not Mark.NOBODY
+            and game.get_square_mark(*line[1]) is Mark.NOBODY
+        ):
+            expected_reply = line[1]
+        self.ponder_result = self.ponder_stats = None
+        self.ponder_started = time.time()
+        self.ponder_thread = threading.Thread(
+            target=self._ponder, args=(game.copy(), expected_reply), daemon=True
+        )
+        self.ponder_thread.start()
+
+    def _ponder(self, game: BaseGame, expected_reply: Optional[Address]) -> None:
+        if expected_reply is None:
+            expected_reply, _ = self.search_root(game, 1)
+        game.mark_board(*expected_reply)
+        if game.winner() is not Mark.NOBODY or not game.open_squares():
+            return
+        if self.prepared_move(game) is not None:
+            return
+        self.ponder_position = (game.x_bits, game.o_bits)
+        self.ponder_result = self.search(game, deadline=math.inf)
+        self.ponder_stats = self.last_stats
+        if self.ponder_stats is not None:
+            self.ponder_stats.pondered = True
+
+    def finish_pondering(self, game: BaseGame) -> Optional[Address]:
+        """Stop pondering, returning its move if it was on game's position."""
+        if self.ponder_thread is None:
+            return None
+        hit = self.ponder_position == (game.x_bits, game.o_bits)
+        if hit:
+            remaining = self.ponder_started + self.TIME_CUTOFF - time.time()
+            self.ponder_thread.join(max(0.0, remaining))
+        self.stop_pondering()
+        if hit and self.ponder_result is not None:
+            return self.ponder_result[0]
+        return None
+
+    def stop_pondering(self) -> None:
+        if self.ponder_thread is None:
+            return
+        self.cancelled.set()
+        self.ponder_thread.join()
+        self.cancelled.clear()
+        self.ponder_thread = None
+        self.ponder_position = None
+
+    def close(self) -> None:
+        """Stop pondering and shut down any worker processes."""
+        self.stop_pondering()
+        if self.parallel_search is not None:
+            self.parallel_search.close()
+            self.parallel_search = None
+
+    def tablebase_move(self, game: BaseGame) -> Optional[Address]:
+        tablebase = load_tablebase(type(game))
+        found = tablebase.best_move(game) if tablebase is not None else None
+        return found[0] if found is not None else None
+
+    def book_move(self, game: BaseGame) -> Optional[Address]:
+        book = load_book(type(game))
+        return book.best_move(game) if book is not None else None
+
     def is_first_move(self, game: BaseGame) -> bool:
         return len(game.open_squares()) >= game.SIZE ** 2 - 1
 
@@ -104,87 +237,377 @@ class FlawlessAI(Player):
         else:
             return f"{self} considers all possible outcomes before making their move."
 
-    def score_move(self, game: BaseGame, move: Address, depth: int) -> MoveScore:
-        hypothetical_game = game.__class__(deepcopy(game.board))
-        hypothetical_game.mark_board(*move)
+    def search_root(
+        self, game: BaseGame, depth: int, first_move: Optional[Address] = None
+    ) -> Tuple[Address, MoveScore]:
+        """Find the best move at a fixed depth, trying first_move before the rest."""
+        if self.parallel_search is not None:
+            return self.parallel_search.search_root(self, game, depth, first_move)
+        best_score = MoveScore(-2.0, 0)
+        move = (game.SIZE, game.SIZE)
+        try:
+            for option in self.order_moves(game, 0, first_move):
+                opt_score = self._score_move(
+                    game, option, depth, best_score, HIGHEST_SCORE, 0
+                )
+                if opt_score > best_score:
+                    best_score = opt_score
+                    move = option
+                if best_score.score == 1.0:
+                    break
+        except SearchTimeout:
+            if best_score > LOWEST_SCORE:
+                raise SearchTimeout(move, best_score)
+            raise
+        return move, best_score
+
+    def search(
+        self,
+        game: BaseGame,
+        deadline: Optional[float] = None,
+        max_depth: Optional[int] = None,
+        node_budget: Optional[int] = None,
+        trust_partial_depth: bool = True,
+    ) -> Tuple[Address, MoveScore, int]:
+        """Deepen one ply at a time until the deadline, max_depth or a forced result.
+
+        Returns the best move and score along with the last depth that was
+        searched to completion. The depth 0 search always completes. When the
+        deadline cuts a later depth short, the best root move it finished is
+        still trusted, because the previous best move is always searched first.
+        A node budget cuts deeper searches short the same way once that many
+        more nodes have been searched. Without trust_partial_depth a depth
+        that was cut short is ignored, so the move and score always come from
+        the returned depth.
+        """
+        self.reset_move_ordering()
+        stats = SearchStats()
+        table = self.transposition_table
+        start_nodes, start_cutoffs = self.nodes, self.cutoffs
+        start_hits, start_misses = table.hits, table.misses
+        start_time = iteration_time = time.time()
+        iteration_nodes = self.nodes
+        move, best_score = self.search_root(game, 0)
+        completed_depth = depth = 0
+        self.deadline = deadline
+        if node_budget is not None:
+            self.node_limit = start_nodes + node_budget
+        try:
+            while (
+                best_score.score != 1.0
+                and depth < len(game.open_squares())
+                and (max_depth is None or depth < max_depth)
+            ):
+                self._record_iteration(
+                    stats, depth, iteration_time, iteration_nodes, True
+                )
+                depth += 1
+                iteration_time, iteration_nodes = time.time(), self.nodes
+                move, best_score = self.search_root(game, depth, move)
+                completed_depth = depth
+        except SearchTimeout as timeout:
+            if timeout.best_move is not None and trust_partial_depth:
+                move, best_score = timeout.best_move, timeout.best_score
+        finally:
+            self.deadline = None
+            self.node_limit = None
+        self._record_iteration(
+            stats, depth, iteration_time, iteration_nodes, completed_depth == depth
+        )
+
+        stats.move = move
+        stats.score = best_score.score
+        stats.depth = completed_depth
+        stats.nodes = self.nodes - start_nodes
+        stats.cutoffs = self.cutoffs - start_cutoffs
+        stats.table_hits = table.hits - start_hits
+        stats.table_misses = table.misses - start_misses
+        stats.seconds = time.time() - start_time
+        stats.principal_variation = self.principal_variation(game, move)
+        self.last_stats = stats
+        return move, best_score, completed_depth
+
+    def _record_iteration(
+        self,
+        stats: SearchStats,
+        depth: int,
+        start_time: float,
+        start_nodes: int,
+        completed: bool,
+    ) -> None:
+        stats.iterations.append(
+            IterationStats(
+                depth, self.nodes - start_nodes, time.time() - start_time, completed
+            )
+        )
+
+    def analyze(
+        self,
+        game: BaseGame,
+        max_depth: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> Tuple[Dict[Address, MoveScore], int]:
+        """The exact score of every open square, best first, and the depth used.
 
+        Every move is searched with the full window. Bounds are deliberately
+        not shared between root siblings, since a move cut off by a better
+        sibling would only get a bound rather than the exact score wanted
+        here. The moves share the transposition table, killers and history
+        instead, which is where the saving over separate searches comes from.
+
+        With a deadline, the depth goes up a ply at a time and the last depth
+        finished for every move is returned. Without one, max_depth is
+        searched directly. With neither, every move is searched to the end of
+        the game, which takes far too long on an early Supergame position or
+        any larger board, so interactive callers should always pass a
+        deadline.
+        """
+        self.reset_move_ordering()
+        full_depth = max(len(game.open_squares()) - 1, 0)
+        if max_depth is None or max_depth > full_depth:
+            max_depth = full_depth
+        depth = max_depth if deadline is None else 0
+        scores = self._analyze_at(game, depth)
+        self.deadline = deadline
+        try:
+            while depth < max_depth:
+                scores = self._analyze_at(game, depth + 1)
+                depth += 1
+        except SearchTimeout:
+            pass
+        finally:
+            self.deadline = None
+        best_first = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return dict(best_first), depth
+
+    def _analyze_at(self, game: BaseGame, depth: int) -> Dict[Address, MoveScore]:
+        return {
+            move: self._score_move(game, move, depth, LOWEST_SCORE, HIGHEST_SCORE, 0)
+            for move in self.order_moves(game, 0)
+        }
+
+    def search_to_depth(
+        self, game: BaseGame, max_depth: int
+    ) -> Tuple[Address, MoveScore]:
+        """Deepen one ply at a time up to max_depth, with no time limit."""
+        move, best_score, _ = self.search(game, max_depth=max_depth)
+        return move, best_score
+
+    def principal_variation(self, game: BaseGame, move: Address) -> List[Address]:
+        """The expected line after move, following best replies in the table."""
+        line = [move]
+        hypothetical_game = game.copy()
+        while hypothetical_game.winner() is Mark.NOBODY:
+            hypothetical_game.mark_board(*line[-1])
+            entry = self.transposition_table.entries.get(
+                hypothetical_game.position_hash
+            )
+            if entry is None or entry.best_move is None:
+                break
+            line.append(entry.best_move)
+        return line
+
+    def score_move(
+        self,
+        game: BaseGame,
+        move: Address,
+        depth: int,
+        alpha: MoveScore = LOWEST_SCORE,
+    ) -> MoveScore:
+        """Score a move for the player making it.
+
+        Scores above alpha are exact. Anything at or below alpha only means
+        the move is no better than alpha.
+        """
+        return self._score_move(game, move, depth, alpha, HIGHEST_SCORE, 0)
+
+    def _score_move(
+        self,
+        game: BaseGame,
+        move: Address,
+        depth: int,
+        alpha: MoveScore,
+        beta: MoveScore,
+        ply: int,
+    ) -> MoveScore:
+        """Negamax with an alpha-beta window, scored for the player making move.
+
+        The result is exact when it falls strictly inside (alpha, beta).
+        Otherwise it is only a bound on the true score in the direction of
+        the window edge it crossed. The move is played on game in place and
+        taken back before returning.
+        """
+        if self.deadline is not None and (
+            time.time() > self.deadline or self.cancelled.is_set()
+        ):
+            raise SearchTimeout()
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchTimeout()
+        self.nodes += 1
+        game.mark_board(*move)
+        try:
+            return self._score_marked(game, move, depth, alpha, beta, ply)
+        finally:
+            game.undo_mark()
+
+    def _score_marked(
+        self,
+        hypothetical_game: BaseGame,
+        move: Address,
+        depth: int,
+        alpha: MoveScore,
+        beta: MoveScore,
+        ply: int,
+    ) -> MoveScore:
         winner = hypothetical_game.winner()
         if winner is not Mark.NOBODY:
             return MoveScore(1, 0)
 
+        key = hypothetical_game.position_hash
+        entry = self.transposition_table.get(key)
+        hinted_reply = None
+        if entry is not None:
+            hinted_reply = entry.best_move
+            if entry.depth >= depth and (
+                entry.bound is Bound.EXACT
+                or entry.bound is Bound.LOWER and entry.score >= beta
+                or entry.bound is Bound.UPPER and entry.score <= alpha
+            ):
+                return entry.score
+
         if depth == 0:
-            state_score = self.score_game_state(hypothetical_game)
-            if state_score > 0:
-                # Favors X, which is good if X just went
-                return MoveScore(state_score, 0)
-            elif state_score < 0:
-                # Favors O, which is good if O just went
-                sign = -1 if hypothetical_game.get_square_mark(*move) is Mark.O else 1
-                return MoveScore(sign * state_score, 0)
-            else:
-                return MoveScore(0.0, 0)
+            move_score = self.score_leaf(hypothetical_game, move)
+            self.transposition_table.store(
+                key, TableEntry(move_score, depth, Bound.EXACT)
+            )
+            return move_score
 
-        next_moves = hypothetical_game.open_squares()
-        if not next_moves:  # Tie game
+        if not hypothetical_game.open_squares():  # Tie game
             return MoveScore(0.0, 0)
 
-        minimized_score = MoveScore(2.0, 0)
-        for next_move in next_moves:
-            score = -self.score_move(hypothetical_game, next_move, depth - 1).bump()
-            if score < minimized_score or score == minimized_score and choice([0, 1]):
-                minimized_score = score
-                if minimized_score.score == -1.0:
+        # The best reply is negated and bumped into this move's score, so the
+        # window is carried over to the opponent the same way in reverse.
+        reply_alpha = (-beta).unbump()
+        reply_beta = (-alpha).unbump()
+        best_reply_score = MoveScore(-2.0, 0)
+        best_reply = None
+        replies = self.order_moves(hypothetical_game, ply + 1, hinted_reply)
+        if depth == 1:
+            # Every reply is a leaf, so evaluate them all in one pass
+            leaf_states = evaluate_children(hypothetical_game, replies)
+        for i, reply in enumerate(replies):
+            if depth == 1:
+                reply_score = self._score_leaf_reply(
+                    hypothetical_game,
+                    reply,
+                    leaf_states[i],
+                    max(reply_alpha, best_reply_score),
+                    reply_beta,
+                )
+            else:
+                reply_score = self._score_move(
+                    hypothetical_game,
+                    reply,
+                    depth - 1,
+                    max(reply_alpha, best_reply_score),
+                    reply_beta,
+                    ply + 1,
+                )
+            if reply_score > best_reply_score:
+                best_reply_score = reply_score
+                best_reply = reply
+                if reply_score >= reply_beta:
+                    self.record_cutoff(reply, depth, ply + 1)
                     break
-        return minimized_score
 
-    def score_game_state(self, game: BaseGame) -> float:
-        """A score of 1 means an X victory and a score of -1 means an O victory."""
-        path_scores_sum = 0
-        for path in game.VICTORY_PATHS:
-            score = self.score_path(game, path)
-            if score == game.SIZE ** 2:
-                return 1
-            if score == -game.SIZE ** 2:
-                return -1
-            path_scores_sum += score
-        return 2 / (1 + math.e ** (-path_scores_sum)) - 1
+        if best_reply_score >= reply_beta:
+            bound = Bound.UPPER
+        elif best_reply_score <= reply_alpha:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        move_score = -best_reply_score.bump()
+        self.transposition_table.store(
+            key, TableEntry(move_score, depth, bound, best_reply)
+        )
+        return move_score
 
-    def score_path(self, game: BaseGame, path: Set[Address]) -> int:
-        """As a convention, O is negative and X is positive."""
-        marks_counter = Counter(game.get_square_mark(*address) for address in path)
-        x_count = marks_counter.get(Mark.X, 0)
-        o_count = marks_counter.get(Mark.O, 0)
-        if x_count and o_count:
-            score = 0
+    def _score_leaf_reply(
+        self,
+        game: BaseGame,
+        reply: Address,
+        state_score: Optional[float],
+        alpha: MoveScore,
+        beta: MoveScore,
+    ) -> MoveScore:
+        """_score_move at depth 0, given the state score from evaluate_children."""
+        self.nodes += 1
+        if state_score is None:
+            return MoveScore(1, 0)
+        square = reply[0] * game.SIZE + reply[1]
+        mark = game.next_mark()
+        key = game.position_hash ^ game.ZOBRIST_KEYS[square][mark is Mark.O]
+        entry = self.transposition_table.get(key)
+        if entry is not None and (
+            entry.bound is Bound.EXACT
+            or entry.bound is Bound.LOWER and entry.score >= beta
+            or entry.bound is Bound.UPPER and entry.score <= alpha
+        ):
+            return entry.score
+        return self.leaf_score(state_score, mark)
+
+    def score_leaf(self, hypothetical_game: BaseGame, move: Address) -> MoveScore:
+        return self.leaf_score(
+            self.score_game_state(hypothetical_game),
+            hypothetical_game.get_square_mark(*move),
+        )
+
+    def leaf_score(self, state_score: float, mark: Mark) -> MoveScore:
+        """Score a leaf for the mark that just moved there."""
+        if state_score > 0:
+            # Favors X, which is good if X just went
+            return MoveScore(state_score, 0)
+        elif state_score < 0:
+            # Favors O, which is good if O just went
+            sign = -1 if mark is Mark.O else 1
+            return MoveScore(sign * state_score, 0)
         else:
-            score = x_count ** 2 - o_count ** 2
-        return score
+            return MoveScore(0.0, 0)
 
+    def reset_move_ordering(self) -> None:
+        self.killer_moves: Dict[int, List[Address]] = {}
+        self.history: Dict[Address, int] = {}
 
-@dataclass
-class MoveScore:
-    score: float
-    depth: int
+    def record_cutoff(self, move: Address, depth: int, ply: int) -> None:
+        self.cutoffs += 1
+        killers = self.killer_moves.setdefault(ply, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+        self.history[move] = self.history.get(move, 0) + depth * depth
 
-    def __neg__(self) -> MoveScore:
-        return MoveScore(-self.score, self.depth)
+    def order_moves(
+        self, game: BaseGame, ply: int, first_move: Optional[Address] = None
+    ) -> List[Address]:
+        """Hinted move, then killers, then history, then squares on the most paths."""
+        killers = self.killer_moves.get(ply, [])
 
-    def __lt__(self, other: Any) -> bool:
-        if type(other) != MoveScore:
-            raise TypeError(f"Cannot compare MoveScore to type {type(other)}")
-        return self._comp_tuple() < cast(MoveScore, other)._comp_tuple()
+        def priority(move: Address) -> Tuple[bool, bool, int, int]:
+            square = move[0] * game.SIZE + move[1]
+            return (
+                move == first_move,
+                move in killers,
+                self.history.get(move, 0),
+                len(game.PATHS_BY_SQUARE[square]),
+            )
 
-    def __eq__(self, other: Any) -> bool:
-        if type(other) != MoveScore:
-            raise TypeError(f"Cannot compare MoveScore to type {type(other)}")
-        return self._comp_tuple() == cast(MoveScore, other)._comp_tuple()
+        return sorted(game.open_squares(), key=priority, reverse=True)
 
-    def _comp_tuple(self) -> Tuple[float, int]:
-        if self.score < 0:
-            depth = self.depth
-        else:
-            depth = -self.depth
-        return (self.score, depth)
+    def score_game_state(self, game: BaseGame) -> float:
+        """A score of 1 means an X victory and a score of -1 means an O victory."""
+        return evaluate(game)
 
-    def bump(self) -> MoveScore:
-        return MoveScore(self.score, self.depth + 1)
+    def score_path(self, game: BaseGame, path: Set[Address]) -> int:
+        """As a convention, O is negative and X is positive."""
+        marks = [game.get_square_mark(*address) for address in path]
+        return path_score(marks.count(Mark.X), marks.count(Mark.O))
@@ -1,4 +1,4 @@
-from typing import Set, Tuple
+from typing import Callable, Optional, Set, Tuple
 
 from tictactoe.games import BaseGame
 
@@ -7,15 +7,22 @@ from .base import Player
 
 class Human(Player):
     NAME = "The Human"
+    # Shown when "?" is pressed while choosing a row, if set
+    advisor: Optional[Callable[[BaseGame], str]] = None
 
     def get_move(self, game: BaseGame) -> Tuple[int, int]:
-        self.speaker("Where do you go?\nRow: ")
+        if self.advisor is not None:
+            self.speaker("Where do you go? Press ? for hints.\nRow: ")
+        else:
+            self.speaker("Where do you go?\nRow: ")
 
         valid_keys = self.valid_index_keys(game)
 
         rkey = "-1"
         while rkey not in valid_keys:
             rkey = self.listener()
+            if rkey == "?" and self.advisor is not None:
+                self.speaker(f"\n{self.advisor(game)}\nRow: ")
         row = int(rkey)
         self.speaker(f"{row}, Column: ")
 
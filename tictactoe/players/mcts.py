@@ -0,0 +1,283 @@
+"""A Monte Carlo tree search player for boards too big to search exhaustively.
+
+Each playout walks down the tree by UCT, adds one new position, plays the
+game out with a fast rollout policy and credits the result back up the
+path. The tree is kept between moves: when the next position is a
+descendant of the last one, the matching subtree becomes the new root.
+With workers > 1, each worker process grows its own tree from the same
+position and their root visit counts are added together.
+"""
+from __future__ import annotations
+import math
+import random
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Type
+
+from tictactoe.constants import Address, Mark
+from tictactoe.games import BaseGame
+from tictactoe.games.bitboard import O_COUNT_UNIT, addresses_in
+
+from .base import Player, silent_listener, silent_speaker
+from .peek_ahead import PeekAheadAI
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+
+class Node:
+    __slots__ = ("move", "mark", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(
+        self,
+        move: Optional[Address],
+        mark: Mark,
+        parent: Optional["Node"],
+        untried: List[Address],
+    ):
+        self.move = move
+        self.mark = mark  # Who made the move into this position
+        self.parent = parent
+        self.children: Dict[Address, Node] = {}
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0  # Counted for mark, with a draw worth half a win
+
+    def select_child(self, exploration: float) -> "Node":
+        log_visits = math.log(self.visits)
+        return max(
+            self.children.values(),
+            key=lambda child: child.wins / child.visits
+            + exploration * math.sqrt(log_visits / child.visits),
+        )
+
+
+def untried_moves(game: BaseGame) -> List[Address]:
+    if game.winner() is not Mark.NOBODY:
+        return []
+    moves = list(game.open_squares())
+    random.shuffle(moves)
+    return moves
+
+
+def random_rollout_move(game: BaseGame) -> Address:
+    return random.choice(tuple(game.open_squares()))
+
+
+def peek_ahead_rollout_move(game: BaseGame) -> Address:
+    """Win if possible, otherwise block, otherwise move at random."""
+    own_unit, opponent_unit = 1, O_COUNT_UNIT
+    if game.next_mark() is Mark.O:
+        own_unit, opponent_unit = opponent_unit, own_unit
+    block = None
+    for path, count in enumerate(game.path_counts):
+        needed = game.PATH_LENGTHS[path] - 1
+        if count == needed * own_unit or count == needed * opponent_unit:
+            # Exactly one square of the path is open
+            open_bits = game.VICTORY_MASKS[path] & ~(game.x_bits | game.o_bits)
+            square = divmod(open_bits.bit_length() - 1, game.SIZE)
+            if count == needed * own_unit:
+                return square
+            block = square
+    return block or random_rollout_move(game)
+
+
+# Up to this board size, scanning every path is quicker than keeping a
+# threat index up to date
+SCAN_BOARD_SIZE = 4
+
+ROLLOUT_POLICIES: Dict[str, Callable[[BaseGame], Address]] = {
+    "random": random_rollout_move,
+    "peek_ahead": peek_ahead_rollout_move,
+}
+
+
+def make_rollout_policy(name: str) -> Callable[[BaseGame], Address]:
+    """The named policy for one agent's rollouts.
+
+    On boards bigger than SCAN_BOARD_SIZE, peek ahead rollouts go through a
+    PeekAheadAI of the agent's own, whose threat index follows the rollouts
+    a move at a time rather than scanning every path for every move.
+    """
+    if name != "peek_ahead":
+        return ROLLOUT_POLICIES[name]
+    indexed_move = PeekAheadAI(silent_speaker, silent_listener).choose_move
+
+    def rollout_move(game: BaseGame) -> Address:
+        if game.SIZE <= SCAN_BOARD_SIZE:
+            return peek_ahead_rollout_move(game)
+        return indexed_move(game)
+
+    return rollout_move
+
+
+class MonteCarloAI(Player):
+    NAME = "The Monte Carlo AI Agent"
+    TIME_CUTOFF = 3
+    EXPLORATION = math.sqrt(2)
+
+    def __init__(
+        self,
+        speaker: Callable[[str], None],
+        listener: Callable[[], str],
+        playouts: Optional[int] = None,
+        rollout: str = "peek_ahead",
+        workers: int = 1,
+    ):
+        """Run playouts per move if given, otherwise play until TIME_CUTOFF."""
+        super().__init__(speaker, listener)
+        self.playouts = playouts
+        self.rollout_move = make_rollout_policy(rollout)
+        self.root: Optional[Node] = None
+        self.root_position = (0, 0)
+        self.root_game_type: Optional[Type[BaseGame]] = None
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.workers = workers
+        if workers > 1:
+            import concurrent.futures
+
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                workers, initializer=_start_worker, initargs=(type(self), rollout)
+            )
+
+    def get_move(self, game: BaseGame) -> Tuple[int, int]:
+        deadline = None
+        if self.playouts is None:
+            deadline = time.time() + self.TIME_CUTOFF
+        if self.executor is not None:
+            visits = self.parallel_visits(game, deadline)
+        else:
+            root = self.search(game, self.playouts, deadline)
+            visits = {move: child.visits for move, child in root.children.items()}
+        move = max(visits, key=visits.__getitem__)
+        self.speaker(f"{self} claims {move}. Press any key.\n")
+        self.listener()
+        return move
+
+    def mood(self, game: BaseGame) -> str:
+        return f"{self} imagines how the game might play out."
+
+    def search(
+        self,
+        game: BaseGame,
+        playouts: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> Node:
+        """Grow the tree for game until playouts have run or the deadline passes.
+
+        At least one playout always runs. The game is left as it was found.
+        """
+        root = self.reuse_tree(game)
+        completed = 0
+        while True:
+            self.playout(root, game)
+            completed += 1
+            if playouts is not None and completed >= playouts:
+                break
+            if deadline is not None and time.time() > deadline:
+                break
+            if playouts is None and deadline is None:
+                break
+        return root
+
+    def reuse_tree(self, game: BaseGame) -> Node:
+        """The node for game in the last tree if there is one, or a new root."""
+        node = self.root
+        root_x, root_o = self.root_position
+        if type(game) is not self.root_game_type:
+            node = None
+        elif root_x & ~game.x_bits or root_o & ~game.o_bits:
+            node = None
+        new_x = addresses_in(game.SIZE, game.x_bits & ~root_x)
+        new_o = addresses_in(game.SIZE, game.o_bits & ~root_o)
+        new_marks = {address: Mark.X for address in new_x}
+        new_marks.update((address, Mark.O) for address in new_o)
+        while node is not None and new_marks:
+            mover = Mark.X if node.mark is Mark.O else Mark.O
+            node = next(
+                (
+                    node.children[move]
+                    for move, mark in new_marks.items()
+                    if mark is mover and move in node.children
+                ),
+                None,
+            )
+            if node is not None:
+                del new_marks[node.move]  # type: ignore
+        if node is None:
+            previous_mark = Mark.X if game.next_mark() is Mark.O else Mark.O
+            node = Node(None, previous_mark, None, untried_moves(game))
+        node.parent = None
+        self.root = node
+        self.root_position = (game.x_bits, game.o_bits)
+        self.root_game_type = type(game)
+        return node
+
+    def playout(self, root: Node, game: BaseGame) -> None:
+        node = root
+        moves_made = 0
+        try:
+            while not node.untried and node.children:
+                node = node.select_child(self.EXPLORATION)
+                game.mark_board(*node.move)  # type: ignore
+                moves_made += 1
+            if node.untried:
+                move = node.untried.pop()
+                mover = game.next_mark()
+                game.mark_board(*move)
+                moves_made += 1
+                child = Node(move, mover, node, untried_moves(game))
+                node.children[move] = child
+                node = child
+            while game.winner() is Mark.NOBODY and game.open_squares():
+                game.mark_board(*self.rollout_move(game))
+                moves_made += 1
+            winner = game.winner()
+        finally:
+            for _ in range(moves_made):
+                game.undo_mark()
+
+        while node is not None:
+            node.visits += 1
+            if winner is node.mark:
+                node.wins += 1.0
+            elif winner is Mark.NOBODY:
+                node.wins += 0.5
+            node = node.parent  # type: ignore
+
+    def parallel_visits(
+        self, game: BaseGame, deadline: Optional[float]
+    ) -> Dict[Address, int]:
+        """Root visit counts summed over a tree grown in each worker process."""
+        assert self.executor is not None
+        playouts = None
+        if self.playouts is not None:
+            playouts = max(1, self.playouts // self.workers)
+        futures = [
+            self.executor.submit(_search_in_worker, game, playouts, deadline)
+            for _ in range(self.workers)
+        ]
+        visits: Dict[Address, int] = {}
+        for future in futures:
+            for move, count in future.result().items():
+                visits[move] = visits.get(move, 0) + count
+        return visits
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+_worker: Dict[str, MonteCarloAI] = {}
+
+
+def _start_worker(agent_type: type, rollout: str) -> None:
+    # Forked workers would otherwise all share the parent's random state
+    random.seed()
+    _worker["agent"] = agent_type(silent_speaker, silent_listener, rollout=rollout)
+
+
+def _search_in_worker(
+    game: BaseGame, playouts: Optional[int], deadline: Optional[float]
+) -> Dict[Address, int]:
+    root = _worker["agent"].search(game, playouts, deadline)
+    return {move: child.visits for move, child in root.children.items()}
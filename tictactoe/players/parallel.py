@@ -0,0 +1,230 @@
+"""Root-parallel search for FlawlessAI.
+
+Each root move is scored in a worker process with its own long-lived agent,
+so transposition tables stay warm from one search to the next. Workers share
+the best score found so far through shared memory and use it as their alpha
+bound. The serial root loop is then replayed over the results, re-searching
+any move whose bound leaves the decision open, so the chosen move and score
+are the same as FlawlessAI.search_root would find for the same move order.
+Each root search has its own generation number in shared memory, and a
+worker stops at its next node once the generation moves on, so root moves
+left over from a finished search never hold up the next one.
+
+Measure the speedup on this machine with:
+
+    python -m tictactoe.players.parallel --depth 4 --workers 1 2 4 8
+"""
+from __future__ import annotations
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import math
+import multiprocessing
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Type
+
+from tictactoe.constants import Address, Mark
+from tictactoe.games import BaseGame, Supergame
+
+from .base import silent_listener, silent_speaker
+from .scores import LOWEST_SCORE, MoveScore, SearchTimeout
+
+if TYPE_CHECKING:
+    from .flawless import FlawlessAI
+
+_worker: Dict[str, object] = {}
+
+
+def _start_worker(agent_type: Type[FlawlessAI], table_size, bound, lock) -> None:
+    _worker["agent"] = agent_type(silent_speaker, silent_listener, table_size)
+    _worker["bound"] = bound
+    _worker["lock"] = lock
+
+
+def _read_bound(generation: int) -> MoveScore:
+    bound = _worker["bound"]
+    with _worker["lock"]:  # type: ignore
+        current_generation, score, depth = bound[:]  # type: ignore
+    if current_generation != generation:
+        return LOWEST_SCORE
+    return MoveScore(score, int(depth))
+
+
+def _publish_bound(generation: int, move_score: MoveScore) -> None:
+    bound = _worker["bound"]
+    with _worker["lock"]:  # type: ignore
+        current_generation, score, depth = bound[:]  # type: ignore
+        if current_generation == generation and move_score > MoveScore(
+            score, int(depth)
+        ):
+            bound[1:] = [move_score.score, move_score.depth]  # type: ignore
+
+
+class _StaleGeneration:
+    """Stands in for a worker agent's cancelled event during one root search.
+
+    It is set once the search's generation is no longer the current one.
+    """
+
+    def __init__(self, generation: int):
+        self.generation = generation
+
+    def is_set(self) -> bool:
+        return _worker["bound"][0] != self.generation  # type: ignore
+
+
+def _score_root_move(
+    game: BaseGame,
+    move: Address,
+    depth: int,
+    generation: int,
+    deadline: Optional[float],
+    node_budget: Optional[int],
+    alpha: Optional[MoveScore] = None,
+) -> Tuple[MoveScore, bool, int]:
+    """Score a root move, returning the score, whether it is exact and the nodes."""
+    agent: FlawlessAI = _worker["agent"]  # type: ignore
+    if alpha is None:
+        alpha = _read_bound(generation)
+    start_nodes = agent.nodes
+    # Cancellation is only checked alongside a deadline
+    agent.deadline = math.inf if deadline is None else deadline
+    agent.cancelled = _StaleGeneration(generation)  # type: ignore
+    if node_budget is not None:
+        agent.node_limit = start_nodes + node_budget
+    try:
+        move_score = agent.score_move(game, move, depth, alpha)
+    finally:
+        agent.deadline = agent.node_limit = None
+    exact = move_score > alpha
+    if exact:
+        _publish_bound(generation, move_score)
+    return move_score, exact, agent.nodes - start_nodes
+
+
+class ParallelRootSearch:
+    def __init__(
+        self,
+        agent_type: Type[FlawlessAI],
+        workers: int,
+        table_size: Optional[int] = None,
+    ):
+        self.workers = workers
+        self.generation = 0
+        self.lock = multiprocessing.Lock()
+        # Generation of the current search, then the best score and its depth
+        self.bound = multiprocessing.Array("d", [0.0, -2.0, 0.0], lock=False)
+        self.executor = ProcessPoolExecutor(
+            workers,
+            initializer=_start_worker,
+            initargs=(agent_type, table_size, self.bound, self.lock),
+        )
+
+    def search_root(
+        self,
+        agent: FlawlessAI,
+        game: BaseGame,
+        depth: int,
+        first_move: Optional[Address] = None,
+    ) -> Tuple[Address, MoveScore]:
+        self.generation += 1
+        with self.lock:
+            self.bound[:] = [self.generation, -2.0, 0.0]
+        options = agent.order_moves(game, 0, first_move)
+        search_args = (depth, self.generation, agent.deadline)
+        futures = [
+            self.executor.submit(
+                _score_root_move, game, option, *search_args, self.nodes_left(agent)
+            )
+            for option in options
+        ]
+
+        best_score = MoveScore(-2.0, 0)
+        move = (game.SIZE, game.SIZE)
+        try:
+            for option, future in zip(options, futures):
+                opt_score, exact, nodes = future.result()
+                agent.nodes += nodes
+                if not exact and opt_score > best_score:
+                    # Only a bound from a stronger alpha, so ask the serial question
+                    opt_score, exact, nodes = self.executor.submit(
+                        _score_root_move,
+                        game,
+                        option,
+                        *search_args,
+                        self.nodes_left(agent),
+                        best_score,
+                    ).result()
+                    agent.nodes += nodes
+                if opt_score > best_score:
+                    best_score = opt_score
+                    move = option
+                if best_score.score == 1.0:
+                    break
+                if agent.node_limit is not None and agent.nodes >= agent.node_limit:
+                    raise SearchTimeout()
+        except SearchTimeout:
+            if best_score > LOWEST_SCORE:
+                raise SearchTimeout(move, best_score)
+            raise
+        finally:
+            for future in futures:
+                future.cancel()
+            self.retire_generation()
+        return move, best_score
+
+    def nodes_left(self, agent: FlawlessAI) -> Optional[int]:
+        """What remains of agent's node budget, shared by every running worker.
+
+        Workers that are already running each get the whole remainder, so the
+        budget can be overshot by up to one remainder per worker.
+        """
+        if agent.node_limit is None:
+            return None
+        return max(agent.node_limit - agent.nodes, 0)
+
+    def retire_generation(self) -> None:
+        """Stop any root searches still running at their next node."""
+        self.generation += 1
+        with self.lock:
+            self.bound[0] = self.generation
+
+    def close(self) -> None:
+        self.retire_generation()
+        self.executor.shutdown()
+
+
+def measure_speedup(
+    game: BaseGame, depth: int, worker_counts: List[int]
+) -> List[Tuple[int, float, float]]:
+    """Time one root search per worker count, against the serial search."""
+    from .flawless import FlawlessAI
+
+    start_time = time.time()
+    FlawlessAI(silent_speaker, silent_listener).search_root(game, depth)
+    serial_time = time.time() - start_time
+    results = []
+    for workers in worker_counts:
+        agent = FlawlessAI(silent_speaker, silent_listener, workers=workers)
+        start_time = time.time()
+        agent.search_root(game, depth)
+        elapsed = time.time() - start_time
+        results.append((workers, elapsed, serial_time / elapsed))
+        agent.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure parallel search speedup.")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    X, Q, _ = Mark.X, Mark.O, Mark.NOBODY
+    game = Supergame([[_, _, _, _], [_, X, Q, _], [_, _, X, _], [_, _, _, Q]])
+    print(f"{'workers':>8} {'seconds':>8} {'speedup':>8}")
+    for workers, elapsed, speedup in measure_speedup(game, args.depth, args.workers):
+        print(f"{workers:>8} {elapsed:>8.2f} {speedup:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,37 @@
-from copy import deepcopy
 from random import choice
-from typing import Tuple
+from typing import Callable, Tuple
 
 from tictactoe.games import BaseGame
-from tictactoe.constants import Mark
+from tictactoe.constants import Address, Mark
 
 from .base import Player
+from .threats import ThreatIndex
 
 
 class PeekAheadAI(Player):
     NAME = "The Peek Ahead AI Agent"
 
+    def __init__(self, speaker: Callable[[str], None], listener: Callable[[], str]):
+        super().__init__(speaker, listener)
+        self.threats = ThreatIndex()
+
     def get_move(self, game: BaseGame) -> Tuple[int, int]:
-        options = game.open_squares()
-        own_mark = game.next_mark()
-        opponent_mark = Mark.X if own_mark is Mark.O else Mark.O
-        winning_move, defensive_move = None, None
-        for option in options:
-            hypothetical_game = game.__class__(deepcopy(game.board))
-            hypothetical_game.mark_board(*option, own_mark)
-            if hypothetical_game.winner() is own_mark:
-                winning_move = option
-            if defensive_move is None:
-                hypothetical_game.mark_board(*option, opponent_mark, force=True)
-                if hypothetical_game.winner() is opponent_mark:
-                    defensive_move = option
-        move = winning_move or defensive_move or choice(list(options))
+        move = self.choose_move(game)
         self.speaker(f"{self} claims {move}. Press any key.\n")
         self.listener()
         return move
 
+    def choose_move(self, game: BaseGame) -> Address:
+        """Win if possible, otherwise block, otherwise move at random."""
+        self.threats.update(game)
+        own_mark = game.next_mark()
+        opponent_mark = Mark.X if own_mark is Mark.O else Mark.O
+        return (
+            self.threats.winning_square(own_mark)
+            or self.threats.winning_square(opponent_mark)
+            or choice(list(game.open_squares()))
+        )
+
     def mood(self, game: BaseGame) -> str:
         if len(game.open_squares()) == 1:
             return f"{self} doesn't have much to think about."
@@ -0,0 +1,34 @@
+from typing import Dict, Type
+
+from .base import Player
+from .flawless import FlawlessAI
+from .human import Human
+from .mcts import MonteCarloAI
+from .peek_ahead import PeekAheadAI
+from .random import RandomAI
+
+PLAYER_TYPES: Dict[str, Type[Player]] = {
+    "human": Human,
+    "random": RandomAI,
+    "peek_ahead": PeekAheadAI,
+    "flawless": FlawlessAI,
+    "mcts": MonteCarloAI,
+}
+
+
+def player_type_by_name(name: str) -> Type[Player]:
+    """Look a player type up by its short name or its class name."""
+    for short_name, player_type in PLAYER_TYPES.items():
+        if name.lower() in (short_name, player_type.__name__.lower()):
+            return player_type
+    raise ValueError(
+        f"Unknown player {name!r}, expected one of {', '.join(PLAYER_TYPES)}"
+    )
+
+
+def computer_player_type_by_name(name: str) -> Type[Player]:
+    """Like player_type_by_name, but refusing players that wait on a keyboard."""
+    player_type = player_type_by_name(name)
+    if issubclass(player_type, Human):
+        raise ValueError(f"{name!r} is not a computer player")
+    return player_type
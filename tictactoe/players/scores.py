@@ -0,0 +1,60 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import total_ordering
+from typing import Any, Optional, Tuple, cast
+
+from tictactoe.constants import Address
+
+
+@total_ordering
+@dataclass
+class MoveScore:
+    score: float
+    depth: int
+
+    def __neg__(self) -> MoveScore:
+        return MoveScore(-self.score, self.depth)
+
+    def __lt__(self, other: Any) -> bool:
+        if type(other) != MoveScore:
+            raise TypeError(f"Cannot compare MoveScore to type {type(other)}")
+        return self._comp_tuple() < cast(MoveScore, other)._comp_tuple()
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) != MoveScore:
+            raise TypeError(f"Cannot compare MoveScore to type {type(other)}")
+        return self._comp_tuple() == cast(MoveScore, other)._comp_tuple()
+
+    def _comp_tuple(self) -> Tuple[float, int]:
+        if self.score < 0:
+            depth = self.depth
+        else:
+            depth = -self.depth
+        return (self.score, depth)
+
+    def bump(self) -> MoveScore:
+        return MoveScore(self.score, self.depth + 1)
+
+    def unbump(self) -> MoveScore:
+        return MoveScore(self.score, self.depth - 1)
+
+
+# Scores beyond any real outcome, used to open a full search window
+LOWEST_SCORE = MoveScore(-2.0, 0)
+HIGHEST_SCORE = MoveScore(2.0, 0)
+
+
+class SearchTimeout(Exception):
+    """Raised inside a search when its deadline, cancellation or node budget ends it.
+
+    Carries the best root move found so far at the interrupted depth, if any.
+    """
+
+    def __init__(
+        self,
+        best_move: Optional[Address] = None,
+        best_score: Optional[MoveScore] = None,
+    ):
+        super().__init__(best_move, best_score)
+        self.best_move = best_move
+        self.best_score = best_score
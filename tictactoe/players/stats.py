@@ -0,0 +1,64 @@
+from dataclasses import asdict, dataclass, field
+import json
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+from tictactoe.constants import Address
+
+
+@dataclass
+class IterationStats:
+    depth: int
+    nodes: int
+    seconds: float
+    completed: bool
+
+
+@dataclass
+class SearchStats:
+    """What one FlawlessAI move cost and what it found.
+
+    Moves taken from a tablebase, book or opening rule have no iterations.
+    Nodes searched in parallel worker processes are not counted.
+    """
+
+    move: Optional[Address] = None
+    score: Optional[float] = None
+    depth: int = 0  # Deepest iteration that completed
+    nodes: int = 0
+    cutoffs: int = 0
+    table_hits: int = 0
+    table_misses: int = 0
+    seconds: float = 0.0
+    iterations: List[IterationStats] = field(default_factory=list)
+    principal_variation: List[Address] = field(default_factory=list)
+    pondered: bool = False  # Searched on the opponent's time
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        if not self.iterations:
+            return f"Played {self.move} without searching."
+        line = " ".join(f"{row},{col}" for row, col in self.principal_variation)
+        return ("Pondered. " if self.pondered else "") + (
+            f"Depth {self.depth}, {self.nodes} nodes in {self.seconds:.2f}s "
+            f"({self.nodes_per_second:.0f}/s), {self.cutoffs} cutoffs, "
+            f"{self.table_hits} table hits. Line: {line}"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+
+def json_lines_writer(stream: TextIO) -> Callable[[SearchStats], None]:
+    """A stats callback that writes each record to stream as one line of JSON."""
+
+    def write(stats: SearchStats) -> None:
+        stream.write(stats.to_json() + "\n")
+        stream.flush()
+
+    return write
@@ -0,0 +1,71 @@
+"""Immediate wins and blocks found by lookup instead of by trying moves.
+
+A path with one open square and every other square held by the same mark
+is a threat: that mark wins by taking the open square. A ThreatIndex keeps
+the squares that complete a threat for each mark. It catches up with a
+game by looking only at the paths through squares that changed since it
+last looked, whether moves were made or taken back, so following a game
+or a rollout costs a few path checks per move whatever the board size.
+"""
+from typing import Dict, Iterable, Optional, Set, Tuple, Type
+
+from tictactoe.constants import Address, Mark
+from tictactoe.games import BaseGame
+from tictactoe.games.bitboard import O_COUNT_UNIT
+
+
+class ThreatIndex:
+    def __init__(self) -> None:
+        self.reset(None)
+
+    def reset(self, game_type: Optional[Type[BaseGame]]) -> None:
+        """Forget every threat, as for an empty board of game_type."""
+        self.game_type = game_type
+        self.x_bits = self.o_bits = 0
+        self.threats: Dict[int, Tuple[Mark, Address]] = {}  # By path
+        # How many threats each square completes, for each mark
+        self.squares: Dict[Mark, Dict[Address, int]] = {Mark.X: {}, Mark.O: {}}
+
+    def update(self, game: BaseGame) -> None:
+        if type(game) is not self.game_type:
+            self.reset(type(game))
+        changed = (game.x_bits ^ self.x_bits) | (game.o_bits ^ self.o_bits)
+        paths: Iterable[int]
+        if changed & (changed - 1) == 0:
+            # One square, as after a single move, or none
+            paths = game.PATHS_BY_SQUARE[changed.bit_length() - 1] if changed else ()
+        else:
+            changed_paths: Set[int] = set()
+            while changed:
+                low_bit = changed & -changed
+                changed_paths.update(game.PATHS_BY_SQUARE[low_bit.bit_length() - 1])
+                changed ^= low_bit
+            paths = changed_paths
+        open_bits = ~(game.x_bits | game.o_bits)
+        for path in paths:
+            old_threat = self.threats.pop(path, None)
+            if old_threat is not None:
+                mark, square = old_threat
+                squares = self.squares[mark]
+                squares[square] -= 1
+                if not squares[square]:
+                    del squares[square]
+            count = game.path_counts[path]
+            needed = game.PATH_LENGTHS[path] - 1
+            if count == needed:
+                mark = Mark.X
+            elif count == needed * O_COUNT_UNIT:
+                mark = Mark.O
+            else:
+                continue
+            open_bit = game.VICTORY_MASKS[path] & open_bits
+            square = divmod(open_bit.bit_length() - 1, game.SIZE)
+            self.threats[path] = (mark, square)
+            squares = self.squares[mark]
+            squares[square] = squares.get(square, 0) + 1
+        self.x_bits, self.o_bits = game.x_bits, game.o_bits
+
+    def winning_square(self, mark: Mark) -> Optional[Address]:
+        """A square that wins at once for mark, as of the last update."""
+        squares = self.squares[mark]
+        return next(iter(squares)) if squares else None
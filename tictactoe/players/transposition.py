@@ -0,0 +1,72 @@
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from tictactoe.constants import Address
+
+from .scores import MoveScore
+
+
+class Bound(Enum):
+    EXACT = 0
+    LOWER = 1  # The true score is at least the stored score
+    UPPER = 2  # The true score is at most the stored score
+
+
+@dataclass
+class TableEntry:
+    score: MoveScore
+    depth: int
+    bound: Bound
+    best_move: Optional[Address] = None
+
+
+class TranspositionTable:
+    """Search results keyed by BaseGame.position_hash.
+
+    Holds at most max_entries results and evicts the least recently used one
+    when full, so a long session never grows without limit.
+    """
+
+    def __init__(self, max_entries: int = 200_000):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[int, TableEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: int) -> Optional[TableEntry]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return entry
+
+    def store(self, key: int, entry: TableEntry) -> None:
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -0,0 +1,212 @@
+"""Game records: whole games stored compactly, one after another in a file.
+
+A record file is an 8 byte header followed by records, only ever appended
+to. Each record is a 5 byte header (variant, result, move count and the
+lengths of the two player names), the player names in UTF-8 and then the
+moves, two to a byte with the first move in the low nibble. A square fits
+a nibble on boards up to 4x4, so records cover Game and Supergame.
+
+Records are read back from a memory-mapped file one at a time, so a reader
+never holds more than the record it is on. A record cut short at the end
+of a file, as after a crash while writing, is skipped. Convert records to
+and from tab-separated text with:
+
+    python -m tictactoe.records dump games.ttr > games.txt
+    python -m tictactoe.records load games.txt games.ttr
+"""
+import argparse
+from dataclasses import dataclass
+import mmap
+from pathlib import Path
+import struct
+import sys
+from typing import Iterable, Iterator, List, TextIO, Tuple
+
+from tictactoe.constants import Address, Mark
+from tictactoe.games import BaseGame, game_type_by_name
+
+MAGIC = b"TTTR"
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sBxxx")  # magic, version
+RECORD_HEADER = struct.Struct("<BBBBB")  # variant, winner, moves, name lengths
+VARIANTS = ("game", "supergame")  # Numbered by position
+SIZES = tuple(game_type_by_name(name).SIZE for name in VARIANTS)
+DRAW = "draw"
+
+
+@dataclass
+class GameRecord:
+    game_name: str
+    x_player: str
+    o_player: str
+    winner: Mark
+    moves: List[Address]
+
+    def replay(self) -> BaseGame:
+        """Play the moves out again on a new board."""
+        game = game_type_by_name(self.game_name)()
+        for move in self.moves:
+            game.mark_board(*move)
+        return game
+
+    def pack(self) -> bytes:
+        game_name = self.game_name.lower()
+        if game_name not in VARIANTS:
+            raise ValueError(f"Cannot record {self.game_name!r} games")
+        size = SIZES[VARIANTS.index(game_name)]
+        x_name, o_name = self.x_player.encode(), self.o_player.encode()
+        if max(len(x_name), len(o_name)) > 0xFF:
+            raise ValueError("Player names are limited to 255 bytes")
+        squares = [row * size + col for row, col in self.moves]
+        if len(squares) % 2:
+            squares.append(0)
+        header = RECORD_HEADER.pack(
+            VARIANTS.index(game_name),
+            self.winner.value,
+            len(self.moves),
+            len(x_name),
+            len(o_name),
+        )
+        moves = bytes(
+            low | high << 4 for low, high in zip(squares[::2], squares[1::2])
+        )
+        return header + x_name + o_name + moves
+
+    @classmethod
+    def unpack_from(cls, data, offset: int = 0) -> Tuple["GameRecord", int]:
+        """The record at offset in data and the offset just past it."""
+        variant, winner, move_count, x_length, o_length = RECORD_HEADER.unpack_from(
+            data, offset
+        )
+        game_name, size = VARIANTS[variant], SIZES[variant]
+        names = offset + RECORD_HEADER.size
+        offset = names + x_length + o_length
+        end = offset + (move_count + 1) // 2
+        if end > len(data):
+            raise struct.error("record runs past the end of the data")
+        x_player = bytes(data[names : names + x_length]).decode()
+        o_player = bytes(data[names + x_length : offset]).decode()
+        moves = []
+        for byte in data[offset:end]:
+            moves.append(divmod(byte & 0xF, size))
+            moves.append(divmod(byte >> 4, size))
+        del moves[move_count:]
+        record = cls(game_name, x_player, o_player, Mark(winner), moves)
+        return record, end
+
+    def to_text(self) -> str:
+        winner = DRAW if self.winner is Mark.NOBODY else self.winner.name
+        moves = " ".join(f"{row},{col}" for row, col in self.moves)
+        return "\t".join((self.game_name, self.x_player, self.o_player, winner, moves))
+
+    @classmethod
+    def from_text(cls, line: str) -> "GameRecord":
+        game_name, x_player, o_player, winner, moves = line.rstrip("\n").split("\t")
+        return cls(
+            game_name,
+            x_player,
+            o_player,
+            Mark.NOBODY if winner == DRAW else Mark[winner],
+            [
+                (int(row), int(col))
+                for row, col in (move.split(",") for move in moves.split())
+            ],
+        )
+
+
+class RecordWriter:
+    """Appends records to a file, starting it with a header if it is new."""
+
+    def __init__(self, path: Path):
+        if path.exists() and path.stat().st_size:
+            _check_header(path)
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(FILE_HEADER.pack(MAGIC, VERSION))
+
+    def write(self, record: GameRecord) -> None:
+        self.file.write(record.pack())
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class RecordReader:
+    def __init__(self, path: Path):
+        _check_header(path)
+        with open(path, "rb") as record_file:
+            self.data = mmap.mmap(record_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        offset = FILE_HEADER.size
+        while offset < len(self.data):
+            try:
+                record, offset = GameRecord.unpack_from(self.data, offset)
+            except struct.error:
+                return  # A record left unfinished by an interrupted writer
+            yield record
+
+    def close(self) -> None:
+        self.data.close()
+
+    def __enter__(self) -> "RecordReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _check_header(path: Path) -> None:
+    with open(path, "rb") as record_file:
+        header = record_file.read(FILE_HEADER.size)
+    if len(header) < FILE_HEADER.size or header != FILE_HEADER.pack(MAGIC, VERSION):
+        raise ValueError(f"{path} is not a version {VERSION} game record file")
+
+
+def write_text(records: Iterable[GameRecord], stream: TextIO) -> int:
+    count = 0
+    for record in records:
+        stream.write(record.to_text() + "\n")
+        count += 1
+    return count
+
+
+def read_text(stream: TextIO) -> Iterator[GameRecord]:
+    for line in stream:
+        if line.strip():
+            yield GameRecord.from_text(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert game records.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    dump = commands.add_parser("dump", help="print records as text")
+    dump.add_argument("records", type=Path)
+    load = commands.add_parser("load", help="append records read from text")
+    load.add_argument("text", type=argparse.FileType("r"))
+    load.add_argument("records", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "dump":
+        with RecordReader(args.records) as reader:
+            write_text(reader, sys.stdout)
+    else:
+        with RecordWriter(args.records) as writer:
+            count = 0
+            for record in read_text(args.text):
+                writer.write(record)
+                count += 1
+        print(f"Appended {count} records to {args.records}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
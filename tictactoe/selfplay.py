@@ -0,0 +1,235 @@
+"""Self-play training data: positions labelled with a searched best move.
+
+Games start from a few random moves and are played out by FlawlessAI at a
+fixed depth, or by any other player, and every position on the way is
+labelled with the best move and score FlawlessAI.search_to_depth finds
+for the side to move. Positions stream straight into chunk files holding a
+fixed number of entries each, so memory use stays the same however long a
+run goes on.
+
+A chunk file is a 12 byte header followed by fixed-size entries. Chunk n
+is made from its own seed by a fresh agent, so it comes out the same
+whichever worker makes it. Chunks are written under a temporary name and
+renamed once complete, so a run that is stopped and started again with the
+same arguments only makes the chunks still missing. For example:
+
+    python -m tictactoe.selfplay data/supergame --game supergame \\
+        --chunks 64 --chunk-size 4096 --depth 4 --workers 8
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+import json
+import mmap
+import multiprocessing
+import os
+from pathlib import Path
+import random
+import struct
+import time
+from typing import Any, Dict, Iterator, Optional, Tuple, Type
+
+from tictactoe.arena import make_player
+from tictactoe.constants import Address, Mark
+from tictactoe.games import BaseGame, game_type_by_name
+from tictactoe.players import (
+    FlawlessAI,
+    Player,
+    computer_player_type_by_name,
+    silent_listener,
+    silent_speaker,
+)
+
+MAGIC = b"TTTS"
+VERSION = 1
+HEADER = struct.Struct("<4sBBxxI")  # magic, version, board size, entry count
+# X bits, O bits, side to move, best move square, score, moves to the outcome
+ENTRY = struct.Struct("<QQBBfB")
+SETTINGS_FILE = "settings.json"
+
+
+@dataclass
+class Sample:
+    x_bits: int
+    o_bits: int
+    next_mark: Mark
+    move: Address
+    score: float
+    depth: int
+
+
+def labelled_positions(
+    game_type: Type[BaseGame],
+    labeller: FlawlessAI,
+    depth: int,
+    opening_plies: int,
+    rng: random.Random,
+    player: Optional[Player] = None,
+) -> Iterator[Sample]:
+    """Label positions from one self-play game after another, without end.
+
+    Each game opens with opening_plies random moves. After that the labelled
+    best move is played, or player's move if there is one.
+    """
+    while True:
+        game = game_type()
+        for _ in range(opening_plies):
+            if game.winner() is not Mark.NOBODY or not game.open_squares():
+                break
+            game.mark_board(*rng.choice(sorted(game.open_squares())))
+        while game.winner() is Mark.NOBODY and game.open_squares():
+            move, score = labeller.search_to_depth(game, depth)
+            mark = game.next_mark()
+            yield Sample(game.x_bits, game.o_bits, mark, move, score.score, score.depth)
+            if player is not None:
+                move = player.get_move(game)
+            game.mark_board(*move)
+
+
+def chunk_path(directory: Path, chunk: int) -> Path:
+    return directory / f"chunk-{chunk:06d}.ttp"
+
+
+def write_chunk(path: Path, size: int, samples: Iterator[Sample]) -> int:
+    """Write samples to path through a temporary file, returning the count."""
+    temporary_path = path.with_suffix(".tmp")
+    count = 0
+    with open(temporary_path, "wb") as chunk_file:
+        chunk_file.write(HEADER.pack(MAGIC, VERSION, size, 0))
+        for sample in samples:
+            row, col = sample.move
+            chunk_file.write(
+                ENTRY.pack(
+                    sample.x_bits,
+                    sample.o_bits,
+                    sample.next_mark.value,
+                    row * size + col,
+                    sample.score,
+                    sample.depth,
+                )
+            )
+            count += 1
+        chunk_file.seek(0)
+        chunk_file.write(HEADER.pack(MAGIC, VERSION, size, count))
+        chunk_file.flush()
+        os.fsync(chunk_file.fileno())
+    os.replace(temporary_path, path)
+    return count
+
+
+def read_chunk(path: Path) -> Iterator[Sample]:
+    with open(path, "rb") as chunk_file:
+        data = mmap.mmap(chunk_file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        magic, version, size, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} self-play chunk")
+        for offset in range(HEADER.size, HEADER.size + count * ENTRY.size, ENTRY.size):
+            x_bits, o_bits, mark, square, score, depth = ENTRY.unpack_from(data, offset)
+            yield Sample(x_bits, o_bits, Mark(mark), divmod(square, size), score, depth)
+    finally:
+        data.close()
+
+
+def read_samples(directory: Path) -> Iterator[Sample]:
+    """Every sample of every finished chunk in directory, in chunk order."""
+    for path in sorted(directory.glob("chunk-*.ttp")):
+        yield from read_chunk(path)
+
+
+def make_chunk(task: Tuple[Dict[str, Any], Path, int]) -> int:
+    settings, directory, chunk = task
+    chunk_seed = f"{settings['seed']}-{chunk}"
+    random.seed(chunk_seed)  # For players that move at random
+    game_type = game_type_by_name(settings["game"])
+    labeller = FlawlessAI(silent_speaker, silent_listener)
+    player = None
+    if settings["player"] is not None:
+        player = make_player(computer_player_type_by_name(settings["player"]), None)
+    samples = labelled_positions(
+        game_type,
+        labeller,
+        settings["depth"],
+        settings["opening_plies"],
+        random.Random(chunk_seed),
+        player,
+    )
+    return write_chunk(
+        chunk_path(directory, chunk),
+        game_type.SIZE,
+        islice(samples, settings["chunk_size"]),
+    )
+
+
+def generate(
+    directory: Path, settings: Dict[str, Any], chunks: int, workers: int
+) -> Iterator[Tuple[int, int]]:
+    """Make every missing chunk up to chunks, yielding each chunk and its size.
+
+    The settings are saved with the chunks, and a directory made with
+    different settings is refused rather than mixed into.
+    """
+    if game_type_by_name(settings["game"]).SIZE > 8:
+        raise ValueError("Self-play chunks only hold boards of up to 64 squares")
+    if settings["player"] is not None:
+        computer_player_type_by_name(settings["player"])
+    directory.mkdir(parents=True, exist_ok=True)
+    settings_path = directory / SETTINGS_FILE
+    if settings_path.exists():
+        saved = json.loads(settings_path.read_text())
+        if saved != settings:
+            raise ValueError(
+                f"{directory} was started with different settings: {saved}"
+            )
+    else:
+        settings_path.write_text(json.dumps(settings, indent=2))
+    missing = [
+        chunk for chunk in range(chunks) if not chunk_path(directory, chunk).exists()
+    ]
+    tasks = ((settings, directory, chunk) for chunk in missing)
+    with ProcessPoolExecutor(workers) as executor:
+        yield from zip(missing, executor.map(make_chunk, tasks))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Make labelled self-play positions.")
+    parser.add_argument("directory", type=Path, help="where the chunks are written")
+    parser.add_argument("--game", default="supergame", help="game, supergame or NxN-k")
+    parser.add_argument("--chunks", type=int, default=16)
+    parser.add_argument("--chunk-size", type=int, default=4096, help="positions")
+    parser.add_argument("--depth", type=int, default=4, help="labelling search depth")
+    parser.add_argument("--opening-plies", type=int, default=4, help="random moves")
+    parser.add_argument(
+        "--player", help="player making the moves, instead of the labelled ones"
+    )
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    settings = {
+        "game": args.game.lower(),
+        "chunk_size": args.chunk_size,
+        "depth": args.depth,
+        "opening_plies": args.opening_plies,
+        "player": args.player,
+        "seed": args.seed,
+    }
+    start_time = time.time()
+    positions = 0
+    try:
+        for chunk, count in generate(
+            args.directory, settings, args.chunks, args.workers
+        ):
+            positions += count
+            elapsed = time.time() - start_time
+            print(
+                f"Chunk {chunk}: {positions} positions in {elapsed:.1f}s "
+                f"({positions / elapsed:.0f}/s)"
+            )
+    except ValueError as error:
+        parser.error(str(error))
+
+
+if __name__ == "__main__":
+    main()
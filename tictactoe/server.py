@@ -0,0 +1,259 @@
+"""An asyncio server hosting many games at once over a line protocol.
+
+Each TCP connection plays one game at a time. Each mark is taken either by
+the client ("human") or by a computer player named as in the arena.
+Computer moves run in a process pool whose workers keep one warm player of
+each type, so a slow search never holds up the event loop. A session looks
+like this, with C for the client and S for the server:
+
+    S: HELLO tictactoe 1
+    C: NEW supergame human flawless
+    S: GAME supergame 4 X
+    S: YOUR_MOVE X
+    C: MOVE 1 1
+    S: MOVED X 1 1
+    S: MOVED O 2 2
+    S: YOUR_MOVE X
+    ...
+    S: END X
+
+END is followed by the winning mark, or DRAW. Bad input gets an ERROR line,
+and the client is asked again. STATS reports the open sessions and games
+played, and QUIT closes the connection. Serve with:
+
+    python -m tictactoe.server --port 8765 --workers 4 --time-cutoff 0.5
+"""
+import argparse
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+import multiprocessing
+import threading
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Type, Union
+
+from tictactoe.arena import make_player
+from tictactoe.constants import Address, Mark
+from tictactoe.games import BaseGame, game_type_by_name
+from tictactoe.players import (
+    Player,
+    player_type_by_name,
+    silent_listener,
+    silent_speaker,
+)
+
+PROTOCOL_VERSION = 1
+
+_local_players = threading.local()
+
+
+def _pooled_move(
+    player_name: str, time_cutoff: Optional[float], game: BaseGame
+) -> Address:
+    """Pick a move with this process's (or thread's) own player of the type.
+
+    Each game type gets players of its own, so search trees and tables are
+    never carried from one game into another.
+    """
+    players: Optional[
+        Dict[Tuple[str, Type[BaseGame], Optional[float]], Player]
+    ] = getattr(_local_players, "players", None)
+    if players is None:
+        players = _local_players.players = {}
+    key = (player_name, type(game), time_cutoff)
+    if key not in players:
+        players[key] = make_player(player_type_by_name(player_name), time_cutoff)
+    return players[key].get_move(game)
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+class PooledPlayer(Player):
+    """A computer player whose moves are made wherever the executor runs them."""
+
+    NAME = "A Pooled AI Agent"
+
+    def __init__(self, player_name: str, time_cutoff: Optional[float] = None):
+        super().__init__(silent_speaker, silent_listener)
+        self.player_name = player_name
+        self.time_cutoff = time_cutoff
+
+    def get_move(self, game: BaseGame) -> Tuple[int, int]:
+        return _pooled_move(self.player_name, self.time_cutoff, game)
+
+    async def get_move_async(
+        self, game: BaseGame, executor: Optional[Executor] = None
+    ) -> Tuple[int, int]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, _pooled_move, self.player_name, self.time_cutoff, game
+        )
+
+    def mood(self, game: BaseGame) -> str:
+        return f"{self.player_name} is thinking."
+
+
+class RemotePlayer:
+    """The client on the other end of a connection, asked for moves by line.
+
+    It only has get_move_async, since its moves can only be awaited.
+    """
+
+    def __init__(
+        self,
+        read_line: Callable[[], Awaitable[str]],
+        send: Callable[[str], Awaitable[None]],
+    ):
+        self.read_line = read_line
+        self.send = send
+
+    async def get_move_async(
+        self, game: BaseGame, executor: Optional[Executor] = None
+    ) -> Tuple[int, int]:
+        await self.send(f"YOUR_MOVE {game.next_mark().name}")
+        while True:
+            words = (await self.read_line()).split()
+            if words == ["QUIT"]:
+                raise ClientDisconnected()
+            try:
+                if words[0] != "MOVE":
+                    raise ValueError()
+                row, col = int(words[1]), int(words[2])
+            except (IndexError, ValueError):
+                await self.send("ERROR expected MOVE <row> <column>")
+                continue
+            if (row, col) not in game.open_squares():
+                await self.send(f"ERROR {row} {col} is not an open square")
+                continue
+            return row, col
+
+
+class GameServer:
+    def __init__(self, workers: int = 0, time_cutoff: Optional[float] = None):
+        """Computer moves go to workers processes, or to threads when 0."""
+        self.executor: Optional[Executor] = None
+        if workers > 0:
+            self.executor = ProcessPoolExecutor(workers)
+        self.time_cutoff = time_cutoff
+        self.sessions = 0
+        self.games_played = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765):
+        # Room for thousands of clients connecting at once
+        return await asyncio.start_server(self.handle, host, port, backlog=4096)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        async def read_line() -> str:
+            line = await reader.readline()
+            if not line:
+                raise ClientDisconnected()
+            return line.decode().strip()
+
+        async def send(line: str) -> None:
+            writer.write(line.encode() + b"\n")
+            await writer.drain()
+
+        self.sessions += 1
+        try:
+            await send(f"HELLO tictactoe {PROTOCOL_VERSION}")
+            while True:
+                words = (await read_line()).split()
+                if not words:
+                    continue
+                if words[0] == "QUIT":
+                    break
+                elif words[0] == "STATS":
+                    await send(f"STATS {self.sessions} {self.games_played}")
+                elif words[0] == "NEW" and len(words) == 4:
+                    await self.new_game(words[1], words[2], words[3], read_line, send)
+                else:
+                    await send("ERROR expected NEW <game> <x player> <o player>")
+        except (ClientDisconnected, ConnectionError):
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def new_game(
+        self,
+        game_name: str,
+        x_name: str,
+        o_name: str,
+        read_line: Callable[[], Awaitable[str]],
+        send: Callable[[str], Awaitable[None]],
+    ) -> None:
+        try:
+            game = game_type_by_name(game_name)()
+            players: Dict[Mark, Union[Player, RemotePlayer]] = {
+                mark: RemotePlayer(read_line, send)
+                if name.lower() == "human"
+                else self.computer_player(name)
+                for mark, name in ((Mark.X, x_name), (Mark.O, o_name))
+            }
+        except ValueError as error:
+            await send(f"ERROR {error}")
+            return
+        client_marks = "".join(
+            mark.name for mark, player in players.items()
+            if isinstance(player, RemotePlayer)
+        )
+        await send(f"GAME {game_name} {game.SIZE} {client_marks or '-'}")
+        winner = await self.play(game, players, send)
+        self.games_played += 1
+        await send(f"END {'DRAW' if winner is Mark.NOBODY else winner.name}")
+
+    def computer_player(self, name: str) -> PooledPlayer:
+        player_type_by_name(name)  # Reject unknown names before the game starts
+        return PooledPlayer(name, self.time_cutoff)
+
+    async def play(
+        self,
+        game: BaseGame,
+        players: Dict[Mark, Union[Player, RemotePlayer]],
+        send: Callable[[str], Awaitable[None]],
+    ) -> Mark:
+        next_mark = game.next_mark()
+        while game.winner() is Mark.NOBODY and next_mark is not Mark.NOBODY:
+            move: Address = await players[next_mark].get_move_async(
+                game, self.executor
+            )
+            game.mark_board(*move)
+            await send(f"MOVED {next_mark.name} {move[0]} {move[1]}")
+            next_mark = game.next_mark()
+        return game.winner()
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+async def serve(host: str, port: int, workers: int, time_cutoff: Optional[float]):
+    game_server = GameServer(workers, time_cutoff)
+    server = await game_server.start(host, port)
+    print(f"Serving on {host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        game_server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Host games over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument(
+        "--time-cutoff", type=float, help="seconds per move for searching players"
+    )
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.time_cutoff))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
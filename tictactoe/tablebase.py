@@ -0,0 +1,298 @@
+"""Tablebases: the solved value of every position of a game.
+
+A tablebase file holds one byte per base-3 board encoding: the top two bits
+are the value for the side to move and the low six bits are the number of
+moves to the end of the game under perfect play. Wins are taken as fast as
+possible and losses put off as long as possible, the same preference as
+MoveScore. Encodings that cannot come up in a game are left as UNKNOWN.
+
+Positions are solved by retrograde analysis, one layer of mark counts at a
+time from the full board back to the empty one. Each layer only reads the
+layer after it, so a layer is split across worker processes that write
+straight into the memory-mapped file. The header records the last finished
+layer, so an interrupted build picks up where it stopped.
+
+Build one with:
+
+    python -m tictactoe.tablebase supergame --workers 8
+"""
+from functools import lru_cache
+from itertools import combinations, islice
+import mmap
+from pathlib import Path
+import struct
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+from tictactoe.constants import Address, Mark
+from tictactoe.games import BaseGame, game_type_by_name
+
+MAGIC = b"TTTT"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBx")  # magic, version, board size, next layer to solve
+TABLEBASE_DIRECTORY = Path(__file__).parent / "data"
+
+UNKNOWN = 0
+WIN = 1
+LOSS = 2
+DRAW = 3
+DEPTH_MASK = 0x3F
+
+
+def tablebase_path(game_type: Type[BaseGame]) -> Path:
+    return TABLEBASE_DIRECTORY / f"{game_type.__name__.lower()}.tb"
+
+
+@lru_cache(maxsize=None)
+def _ternary_tables(size: int) -> Tuple[Tuple[int, ...], ...]:
+    """For each byte of a bitboard, the base-3 digits it contributes as X."""
+    squares = size * size
+    return tuple(
+        tuple(
+            sum(3 ** (8 * chunk + offset) for offset in range(8) if byte >> offset & 1)
+            for byte in range(256)
+        )
+        for chunk in range((squares + 7) // 8)
+    )
+
+
+def position_index(size: int, x_bits: int, o_bits: int) -> int:
+    """The base-3 encoding of a board, with 1 for X and 2 for O on each square."""
+    index = 0
+    for chunk, table in enumerate(_ternary_tables(size)):
+        shift = 8 * chunk
+        index += table[x_bits >> shift & 0xFF] + 2 * table[o_bits >> shift & 0xFF]
+    return index
+
+
+class Tablebase:
+    def __init__(self, path: Path, writable: bool = False):
+        mode = "r+b" if writable else "rb"
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        with open(path, mode) as tablebase_file:
+            self.data = mmap.mmap(tablebase_file.fileno(), 0, access=access)
+        magic, version, self.size, self.next_layer = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} tablebase")
+
+    @classmethod
+    def create(cls, path: Path, size: int) -> "Tablebase":
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as tablebase_file:
+            tablebase_file.write(HEADER.pack(MAGIC, VERSION, size, size * size))
+            tablebase_file.truncate(HEADER.size + 3 ** (size * size))
+        return cls(path, writable=True)
+
+    @property
+    def complete(self) -> bool:
+        return self.next_layer == 0xFF
+
+    def finish_layer(self, layer: int) -> None:
+        self.data.flush()
+        self.next_layer = layer - 1 if layer else 0xFF
+        HEADER.pack_into(self.data, 0, MAGIC, VERSION, self.size, self.next_layer)
+        self.data.flush()
+
+    def entry(self, index: int) -> Tuple[int, int]:
+        """The value and depth stored for a base-3 position index."""
+        byte = self.data[HEADER.size + index]
+        return byte >> 6, byte & DEPTH_MASK
+
+    def store(self, index: int, value: int, depth: int) -> None:
+        self.data[HEADER.size + index] = value << 6 | depth
+
+    def probe(self, game: BaseGame) -> Tuple[int, int]:
+        return self.entry(position_index(self.size, game.x_bits, game.o_bits))
+
+    def move_values(self, game: BaseGame) -> Dict[Address, Tuple[int, int]]:
+        """The value and depth of each move, from the point of view of the mover."""
+        index = position_index(self.size, game.x_bits, game.o_bits)
+        digit = 1 if game.next_mark() is Mark.X else 2
+        values = {}
+        for row, col in game.open_squares():
+            value, depth = self.entry(index + digit * 3 ** (row * self.size + col))
+            values[(row, col)] = (_FLIPPED[value], depth)
+        return values
+
+    def best_move(self, game: BaseGame) -> Optional[Tuple[Address, int, int]]:
+        """A perfect move along with its value and depth, if the game is solved."""
+        if game.SIZE != self.size or not self.complete:
+            return None
+        values = self.move_values(game)
+        if not values:
+            return None
+        return max(
+            ((move, value, depth) for move, (value, depth) in values.items()),
+            key=lambda option: _preference(option[1], option[2]),
+        )
+
+    def close(self) -> None:
+        self.data.close()
+
+
+# A child's value is for the opponent, so it flips for the player who moved
+_FLIPPED = {UNKNOWN: UNKNOWN, WIN: LOSS, LOSS: WIN, DRAW: DRAW}
+
+
+def _preference(value: int, depth: int) -> Tuple[int, int]:
+    """Order outcomes for the mover: fast wins, then quick draws, then slow losses."""
+    if value == WIN:
+        return (2, -depth)
+    elif value == DRAW:
+        return (1, -depth)
+    elif value == LOSS:
+        return (0, depth)
+    return (-1, 0)
+
+
+_loaded_tablebases: Dict[Path, Optional[Tablebase]] = {}
+
+
+def load_tablebase(game_type: Type[BaseGame]) -> Optional[Tablebase]:
+    """Memory-map the game type's tablebase once, or return None if there is none."""
+    path = tablebase_path(game_type)
+    if path not in _loaded_tablebases:
+        _loaded_tablebases[path] = Tablebase(path) if path.exists() else None
+    return _loaded_tablebases[path]
+
+
+def is_reachable(victory_masks: Sequence[int], x_bits: int, o_bits: int) -> bool:
+    """Whether a game could reach the position without going on after a win.
+
+    The mark counts are taken to be valid, as layer_positions makes them.
+    Only the player who moved last can have won, and every path they
+    completed must go through one square, the one their last move took.
+    """
+    x_won = [mask for mask in victory_masks if x_bits & mask == mask]
+    o_won = [mask for mask in victory_masks if o_bits & mask == mask]
+    if not x_won and not o_won:
+        return True
+    x_moved_last = bin(x_bits).count("1") > bin(o_bits).count("1")
+    if o_won if x_moved_last else x_won:
+        return False
+    last_square = -1
+    for mask in x_won or o_won:
+        last_square &= mask
+    return last_square != 0
+
+
+def solve_position(
+    tablebase: Tablebase,
+    size: int,
+    victory_masks: Sequence[int],
+    x_bits: int,
+    o_bits: int,
+) -> Tuple[int, int]:
+    for mask in victory_masks:
+        if x_bits & mask == mask or o_bits & mask == mask:
+            return LOSS, 0  # The previous player has already won
+    index = position_index(size, x_bits, o_bits)
+    occupied = x_bits | o_bits
+    digit = 1 if bin(x_bits).count("1") == bin(o_bits).count("1") else 2
+    best: Optional[Tuple[int, int]] = None
+    for square in range(size * size):
+        if occupied >> square & 1:
+            continue
+        child_value, child_depth = tablebase.entry(index + digit * 3 ** square)
+        option = (_FLIPPED[child_value], child_depth + 1)
+        if best is None or _preference(*option) > _preference(*best):
+            best = option
+    return best if best is not None else (DRAW, 0)
+
+
+def layer_positions(
+    squares: int, layer: int, x_squares_chunk: Sequence[Tuple[int, ...]]
+) -> Iterator[Tuple[int, int]]:
+    o_count = layer // 2
+    for x_squares in x_squares_chunk:
+        x_bits = sum(1 << square for square in x_squares)
+        remaining = [square for square in range(squares) if not x_bits >> square & 1]
+        for o_squares in combinations(remaining, o_count):
+            yield x_bits, sum(1 << square for square in o_squares)
+
+
+_worker_state: Dict[str, object] = {}
+
+
+def _start_worker(path: Path, game_name: str) -> None:
+    _worker_state["tablebase"] = Tablebase(path, writable=True)
+    _worker_state["game_type"] = game_type_by_name(game_name)
+
+
+def _solve_chunk(task: Tuple[int, List[Tuple[int, ...]]]) -> int:
+    layer, x_squares_chunk = task
+    tablebase: Tablebase = _worker_state["tablebase"]  # type: ignore
+    game_type: Type[BaseGame] = _worker_state["game_type"]  # type: ignore
+    size = game_type.SIZE
+    solved = 0
+    for x_bits, o_bits in layer_positions(size * size, layer, x_squares_chunk):
+        if not is_reachable(game_type.VICTORY_MASKS, x_bits, o_bits):
+            continue
+        value, depth = solve_position(
+            tablebase, size, game_type.VICTORY_MASKS, x_bits, o_bits
+        )
+        tablebase.store(position_index(size, x_bits, o_bits), value, depth)
+        solved += 1
+    tablebase.data.flush()
+    return solved
+
+
+def _chunks(items: Iterator[Tuple[int, ...]], chunk_size: int):
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def build_tablebase(
+    game_name: str, path: Path, workers: int = 1, report=print
+) -> Tablebase:
+    import multiprocessing
+
+    game_type = game_type_by_name(game_name)
+    size = game_type.SIZE
+    squares = size * size
+    if squares > 63:
+        raise ValueError("Tablebases only hold boards of up to 63 squares")
+    if path.exists():
+        tablebase = Tablebase(path, writable=True)
+        if tablebase.size != size:
+            raise ValueError(f"{path} holds a different board size")
+    else:
+        tablebase = Tablebase.create(path, size)
+
+    with multiprocessing.Pool(
+        workers, initializer=_start_worker, initargs=(path, game_name)
+    ) as pool:
+        while not tablebase.complete:
+            layer = tablebase.next_layer
+            start_time = time.time()
+            x_combinations = combinations(range(squares), (layer + 1) // 2)
+            tasks = ((layer, chunk) for chunk in _chunks(x_combinations, 64))
+            solved = sum(pool.imap_unordered(_solve_chunk, tasks))
+            tablebase.finish_layer(layer)
+            report(
+                f"Layer {layer}: {solved} positions in {time.time() - start_time:.1f}s"
+            )
+    return tablebase
+
+
+def main() -> None:
+    import argparse
+    import multiprocessing
+
+    parser = argparse.ArgumentParser(description="Solve a game into a tablebase.")
+    parser.add_argument("game", help="game or supergame")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--output", type=Path, help="defaults to tictactoe/data")
+    args = parser.parse_args()
+
+    path = args.output or tablebase_path(game_type_by_name(args.game))
+    start_time = time.time()
+    build_tablebase(args.game, path, args.workers)
+    print(f"Solved {args.game} into {path} in {time.time() - start_time:.1f}s")
+
+
+if __name__ == "__main__":
+    main()